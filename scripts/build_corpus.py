@@ -1,4 +1,5 @@
 import argparse
+import os
 
 import sys
 sys.path.insert(0, '../')
@@ -6,6 +7,7 @@ from sejong_corpus_cleaner import get_data_paths
 from sejong_corpus_cleaner import make_lr_corpus
 from sejong_corpus_cleaner import Sentences
 from sejong_corpus_cleaner import write_sentences
+from sejong_corpus_cleaner.lr_table import lr_table_path
 
 
 def main():
@@ -17,6 +19,13 @@ def main():
     parser.add_argument('--corpus_type', type=str, default='sejong',
         choices=['sejong', 'type1', 'type2', 'type3'], help='Corpus type')
     parser.add_argument('--num_sents', type=int, default=-1, help='Maximum number of sentences')
+    parser.add_argument('--parser', type=str, default='soup',
+        choices=['soup', 'stream'], help='Raw Sejong corpus parser backend')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes, -1 uses all cores')
+    parser.add_argument('--cache_dir', type=str, default=None, help='Parse cache directory of raw Sejong corpus files')
+    parser.add_argument('--lr_table_dir', type=str, default=None, help='Directory of L-R tables built by build_lr_table.py')
+    parser.add_argument('--lr_cache_size', type=int, default=100000, help='Maximum size of L-R transformation memo, 0 disables it')
+    parser.add_argument('--dedup', dest='dedup', action='store_true', help='Transform each distinct (eojeol, morphtags) pair once')
 
     args = parser.parse_args()
     input_dir = args.input_dir
@@ -28,24 +37,39 @@ def main():
         input_file_type_ = input_file_type
     corpus_type = args.corpus_type
     num_sents = args.num_sents
+    parser_backend = args.parser
+    n_jobs = args.jobs
+    cache_dir = args.cache_dir
+    lr_cache = args.lr_cache_size if args.lr_cache_size > 0 else None
+    lr_table_dir = args.lr_table_dir
+    dedup = args.dedup
 
     paths = get_data_paths(input_file_type_, input_dir)
     if not paths:
         raise ValueError('Check your input directory')
 
-    sents = Sentences(paths, num_sents=num_sents)
+    sents = Sentences(paths, num_sents=num_sents, parser=parser_backend, n_jobs=n_jobs, cache=cache_dir)
 
     suffix = '_{}{}'.format(input_file_type, '' if num_sents < 0 else '_{}'.format(num_sents))
     path = '{}/corpus_{}{}.txt'.format(output_dir, corpus_type, suffix)
 
+    lr_table = None
+    if lr_table_dir is not None and corpus_type != 'sejong':
+        lr_table = lr_table_path(lr_table_dir, corpus_type)
+        if not os.path.exists(lr_table):
+            raise ValueError('L-R table does not exist: {}'.format(lr_table))
+
     if corpus_type == 'sejong':
         write_sentences(sents, path)
     elif corpus_type == 'type1':
-        make_lr_corpus(sents, filepath=path)
+        make_lr_corpus(sents, filepath=path, lr_cache=lr_cache, lr_table=lr_table, n_jobs=n_jobs,
+            dedup=dedup)
     elif corpus_type == 'type2':
-        make_lr_corpus(sents, filepath=path, noun_xsv_as_verb=True)
+        make_lr_corpus(sents, filepath=path, noun_xsv_as_verb=True, lr_cache=lr_cache, lr_table=lr_table, n_jobs=n_jobs,
+            dedup=dedup)
     elif corpus_type == 'type3':
-        make_lr_corpus(sents, filepath=path, xsv_as_root=True)
+        make_lr_corpus(sents, filepath=path, xsv_as_root=True, lr_cache=lr_cache, lr_table=lr_table, n_jobs=n_jobs,
+            dedup=dedup)
 
 if __name__ == '__main__':
     main()
@@ -4,7 +4,11 @@ import sys
 sys.path.insert(0, '../')
 from sejong_corpus_cleaner import get_data_paths
 from sejong_corpus_cleaner import make_counter
+from sejong_corpus_cleaner import make_counter_incrementally
+from sejong_corpus_cleaner import ApproximateCounter
+from sejong_corpus_cleaner import ExternalCounter
 from sejong_corpus_cleaner import Sentences
+from sejong_corpus_cleaner import Vocabulary
 
 def pair_to_str(pair_key):
     eojeol, morphemes = pair_key
@@ -23,6 +27,21 @@ def main():
         choices=['sejong', 'type1', 'type2', 'type3'], help='Corpus type')
     parser.add_argument('--only_morphemes', dest='only_morphemes', action='store_true', help='Count only morphemes')
     parser.add_argument('--num_sents', type=int, default=-1, help='Maximum number of sentences')
+    parser.add_argument('--parser', type=str, default='soup',
+        choices=['soup', 'stream'], help='Raw Sejong corpus parser backend')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes, -1 uses all cores')
+    parser.add_argument('--cache_dir', type=str, default=None, help='Parse cache directory of raw Sejong corpus files')
+    parser.add_argument('--vocabulary', type=str, default=None, help='Vocabulary file path')
+    parser.add_argument('--compact', dest='compact', action='store_true', help='Count with integer-keyed compact counter')
+    parser.add_argument('--approximate_top_k', type=int, default=-1,
+        help='If positive, it counts approximately with fixed memory and saves the top k keys')
+    parser.add_argument('--epsilon', type=float, default=0.00001, help='Relative error bound of approximate counting')
+    parser.add_argument('--delta', type=float, default=0.01, help='Probability that the error exceeds the bound')
+    parser.add_argument('--external_max_keys', type=int, default=-1,
+        help='If positive, it keeps at most this number of keys in memory and merges sorted run files')
+    parser.add_argument('--temp_dir', type=str, default=None, help='Run file directory of external counting')
+    parser.add_argument('--counter_cache_dir', type=str, default=None,
+        help='Per-file counter directory. Only the changed files are counted')
 
     args = parser.parse_args()
     input_dir = args.input_dir
@@ -33,38 +52,75 @@ def main():
     corpus_type = args.corpus_type
     eojeol_morpheme_pair = not args.only_morphemes
     num_sents = args.num_sents
+    parser_backend = args.parser
+    n_jobs = args.jobs
+    cache_dir = args.cache_dir
+    vocabulary = None if args.vocabulary is None else Vocabulary(args.vocabulary)
+    compact = args.compact
+    counter_cache_dir = args.counter_cache_dir
+    if counter_cache_dir is not None and (num_sents > 0 or compact or args.vocabulary is not None
+        or args.approximate_top_k > 0 or args.external_max_keys > 0):
+        raise ValueError('counter_cache_dir is not available with num_sents, compact, vocabulary, '
+            'approximate_top_k and external_max_keys')
+    if args.approximate_top_k > 0 and args.external_max_keys > 0:
+        raise ValueError('approximate_top_k and external_max_keys are not available together')
+    if (args.approximate_top_k > 0 or args.external_max_keys > 0) and (compact or args.vocabulary is not None):
+        raise ValueError('compact and vocabulary are not available with approximate_top_k and external_max_keys')
+    approximate = None
+    if args.approximate_top_k > 0:
+        approximate = ApproximateCounter(args.approximate_top_k, args.epsilon, args.delta)
 
     paths = get_data_paths(input_file_type, input_dir)
     if not paths:
         raise ValueError('Check your input directory')
 
-    sents = Sentences(paths, num_sents=num_sents)
+    sents = Sentences(paths, num_sents=num_sents, parser=parser_backend, n_jobs=n_jobs, cache=cache_dir)
 
     suffix = '' if num_sents < 0 else '_{}'.format(num_sents)
     suffix += '_pair' if eojeol_morpheme_pair else '_morpheme'
     if input_file_type is None:
         input_file_type = 'all'
     suffix += '_{}'.format(input_file_type)
+    if approximate is not None:
+        suffix += '_top{}'.format(args.approximate_top_k)
     path = '{}/counter_{}{}.txt'.format(output_dir, corpus_type, suffix)
 
-    if corpus_type == 'sejong':
-        counter = make_counter(sents, eojeol_morpheme_pair)
-    elif corpus_type == 'type1':
-        counter = make_counter(sents, eojeol_morpheme_pair, convert_lr=True)
-    elif corpus_type == 'type2':
-        counter = make_counter(sents, eojeol_morpheme_pair, convert_lr=True, noun_xsv_as_verb=True)
-    elif corpus_type == 'type3':
-        counter = make_counter(sents, eojeol_morpheme_pair, convert_lr=True, xsv_as_root=True)
+    options = {
+        'convert_lr': corpus_type != 'sejong',
+        'noun_xsv_as_verb': corpus_type == 'type2',
+        'xsv_as_root': corpus_type == 'type3'
+    }
+    external = None
+    if args.external_max_keys > 0:
+        external = ExternalCounter(args.external_max_keys, args.temp_dir)
 
-    to_key = pair_to_str if eojeol_morpheme_pair else morphtag_to_str
-    with open(path, 'w', encoding='utf-8') as f:
-        for key, count in sorted(counter.items(), key=lambda x:-x[1]):
-            if key is None:
-                continue
-            key = to_key(key)
-            f.write('{}\t{}\n'.format(key, count))
+    if counter_cache_dir is not None:
+        counter = make_counter_incrementally(paths, counter_cache_dir, eojeol_morpheme_pair,
+            parser=parser_backend, n_jobs=n_jobs, parse_cache=cache_dir, **options)
+    else:
+        counter = make_counter(sents, eojeol_morpheme_pair, vocabulary=vocabulary, n_jobs=n_jobs,
+            compact=compact, approximate=approximate, external=external, **options)
+
+    if external is not None:
+        with counter:
+            counter.write(path)
+    else:
+        to_key = pair_to_str if eojeol_morpheme_pair else morphtag_to_str
+        with open(path, 'w', encoding='utf-8') as f:
+            if compact or approximate is not None:
+                sorted_items = counter.most_common()
+            else:
+                sorted_items = sorted(counter.items(), key=lambda x:-x[1])
+            for key, count in sorted_items:
+                if key is None:
+                    continue
+                key = to_key(key)
+                f.write('{}\t{}\n'.format(key, count))
 
     print('Saved counter to {}'.format(path))
 
+    if vocabulary is not None:
+        vocabulary.save()
+
 if __name__ == '__main__':
     main()
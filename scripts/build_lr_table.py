@@ -0,0 +1,42 @@
+import argparse
+
+import sys
+sys.path.insert(0, '../')
+from sejong_corpus_cleaner import build_lr_tables
+from sejong_corpus_cleaner import get_data_paths
+from sejong_corpus_cleaner import Sentences
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input_dir', type=str, default='../data/raw/', help='Raw Sejong corpus directory')
+    parser.add_argument('--output_dir', type=str, default='../data/clean/', help='L-R table directory')
+    parser.add_argument('--input_file_type', type=str, default='all',
+        choices=['all', 'written', 'colloquial'], help='Input Sejong corpus types')
+    parser.add_argument('--corpus_type', type=str, default='all',
+        choices=['all', 'type1', 'type2', 'type3'], help='Corpus type')
+    parser.add_argument('--parser', type=str, default='soup',
+        choices=['soup', 'stream'], help='Raw Sejong corpus parser backend')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes, -1 uses all cores')
+    parser.add_argument('--cache_dir', type=str, default=None, help='Parse cache directory of raw Sejong corpus files')
+
+    args = parser.parse_args()
+    input_dir = args.input_dir
+    output_dir = args.output_dir
+    input_file_type = args.input_file_type
+    if input_file_type == 'all':
+        input_file_type = None
+    corpus_types = None if args.corpus_type == 'all' else [args.corpus_type]
+    parser_backend = args.parser
+    n_jobs = args.jobs
+    cache_dir = args.cache_dir
+
+    paths = get_data_paths(input_file_type, input_dir)
+    if not paths:
+        raise ValueError('Check your input directory')
+
+    sents = Sentences(paths, parser=parser_backend, n_jobs=n_jobs, cache=cache_dir)
+    build_lr_tables(sents, output_dir, corpus_types)
+
+if __name__ == '__main__':
+    main()
@@ -1,33 +1,77 @@
 __author__ = 'lovit'
 
+from .cache import ParseCache
+from .columnar import ColumnarCorpus
+from .columnar import write_columnar_corpus
+from .compact import CompactSentence
+from .counter import CompactCounter
+from .counter_cache import CounterCache
+from .external import ExternalCounter
 from .format_checker import check_sejong_tagset
 from .loader import Sentence
 from .loader import Sentences
 from .loader import load_a_sejong_file
+from .loader import iter_a_sejong_file
 from .loader import load_a_sentences_file
+from .loader import iter_a_sentences_file
 from .loader import get_data_paths
+from .manifest import Manifest
 from .lr import to_lr
+from .lr import LRCache
+from .lr_rules import LRRules
+from .lr_rules import as_lr_rules
+from .lr_table import LRTable
+from .lr_table import build_lr_table
+from .lr_table import build_lr_tables
 from .maker import make_lr_eomi_to_sejong_converter
 from .maker import make_counter
+from .maker import make_counter_incrementally
 from .maker import make_lr_corpus
 from .maker import write_sentences
+from .offset_index import IndexedSentences
+from .offset_index import build_offset_index
+from .sketch import ApproximateCounter
+from .sketch import CountMinSketch
 from .simple_tag import to_simple_tag
 from .simple_tag import to_simple_morphtags
 from .utils import check_encoding
+from .vocabulary import Vocabulary
 
 __all__ = [
+    'ParseCache',
+    'ColumnarCorpus',
+    'write_columnar_corpus',
+    'CompactSentence',
+    'CompactCounter',
+    'CounterCache',
+    'ExternalCounter',
     'check_sejong_tagset',
     'Sentence',
     'Sentences',
     'load_a_sejong_file',
+    'iter_a_sejong_file',
     'load_a_sentences_file',
+    'iter_a_sentences_file',
     'get_data_paths',
+    'Manifest',
     'to_lr',
+    'LRCache',
+    'LRRules',
+    'as_lr_rules',
+    'LRTable',
+    'build_lr_table',
+    'build_lr_tables',
     'make_lr_eomi_to_sejong_converter',
     'make_counter',
+    'make_counter_incrementally',
     'make_lr_corpus',
     'write_sentences',
+    'IndexedSentences',
+    'build_offset_index',
+    'ApproximateCounter',
+    'CountMinSketch',
     'to_simple_tag',
     'to_simple_morphtags',
     'check_encoding',
+    'Vocabulary',
 ]
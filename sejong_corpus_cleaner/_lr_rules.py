@@ -1,8 +0,0 @@
-_rules = {
-    '못지': (('못지', 'Adverb'), (None, None)),
-    '그런지는': (('그렇', 'Adjective'), ('ㄴ지는', 'Eomi')),
-    '어떤질': (('어떠하', 'Adjective'), ('ㄴ질', 'Eomi')),
-    '짝짝짝두': (('짝짝짝', 'Noun'), ('두', 'Josa')),
-    '어쩌구': (('어찌하', 'Verb'), ('구', 'Eomi')),
-    '뭘': (('뭐', 'Pronoun'), ('ㄹ', 'Josa')),
-}
\ No newline at end of file
@@ -0,0 +1,179 @@
+from array import array
+import hashlib
+import os
+import pickle
+import zlib
+
+from .utils import cache_dir as default_cache_dir
+
+
+class ParseCache:
+    """
+    Persistent cache of parsed raw Sejong corpus files.
+    A parsed file is stored as (string table, flat id array, n_errors) in a zlib compressed file.
+
+    Arguments
+    ---------
+    cache_dir : str or None
+        Cache directory. If None, it uses '../data/cache/'
+    hash_content : Boolean
+        If True, the cache key uses the sha1 hash of file content.
+        Else, it uses (path, file size, modified time)
+        Default is False
+
+    Attributes
+    ----------
+    n_hits : int
+        Number of cache hits
+    n_misses : int
+        Number of cache misses
+
+    Usage
+    -----
+        >>> cache = ParseCache('../data/cache/')
+        >>> sents = Sentences(paths, cache=cache)
+    """
+    def __init__(self, cache_dir=None, hash_content=False):
+        if cache_dir is None:
+            cache_dir = default_cache_dir
+        self.cache_dir = cache_dir
+        self.hash_content = hash_content
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def key(self, path, *options):
+        """
+        Arguments
+        ---------
+        path : str
+            File path
+        options : str
+            Parsing options such as remain_dummy_morpheme, parser and parser version
+
+        Returns
+        -------
+        key : str
+            sha1 hex digest
+        """
+        if self.hash_content:
+            with open(path, 'rb') as f:
+                source = hashlib.sha1(f.read()).hexdigest()
+        else:
+            stat = os.stat(path)
+            source = '{}|{}|{}'.format(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        key = '|'.join([source] + [str(option) for option in options])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _cache_path(self, key):
+        return '{}/{}.cache'.format(self.cache_dir, key)
+
+    def load(self, key):
+        """
+        Argument
+        --------
+        key : str
+            Return of ParseCache.key
+
+        Returns
+        -------
+        (sents, n_errors) or None
+            sents is list of (eojeols, list of list of (morph, tag))
+            It returns None if the key does not exist
+        """
+        try:
+            with open(self._cache_path(key), 'rb') as f:
+                strings, ids, n_errors = pickle.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, zlib.error):
+            self.n_misses += 1
+            return None
+        self.n_hits += 1
+        return decode_sentences(strings, ids), n_errors
+
+    def save(self, key, sents, n_errors):
+        """
+        Arguments
+        ---------
+        key : str
+            Return of ParseCache.key
+        sents : list of Sentence
+            Parsed sentences
+        n_errors : int
+            Number of failures for parsing text to Sentence
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        strings, ids = encode_sentences(sents)
+        data = zlib.compress(pickle.dumps((strings, ids, n_errors), protocol=pickle.HIGHEST_PROTOCOL))
+        path = self._cache_path(key)
+        # write and rename, because worker processes may write the same key
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+def encode_sentences(sents):
+    """
+    Argument
+    --------
+    sents : list of Sentence
+        Or list of iterable of (eojeol, list of (morph, tag))
+
+    Returns
+    -------
+    strings : list of str
+        String table of eojeols, morphemes and tags
+    ids : bytes
+        Flat unsigned int array. For each sentence,
+        [n_eojeols, (eojeol, n_morphs, (morph, tag) * n_morphs) * n_eojeols]
+    """
+    index = {}
+    def encode(s):
+        i = index.get(s)
+        if i is None:
+            i = len(index)
+            index[s] = i
+        return i
+
+    ids = array('I')
+    for sent in sents:
+        eojeol_morphtags = list(sent)
+        ids.append(len(eojeol_morphtags))
+        for eojeol, morphtags in eojeol_morphtags:
+            ids.append(encode(eojeol))
+            ids.append(len(morphtags))
+            for morph, tag in morphtags:
+                ids.append(encode(morph))
+                ids.append(encode(tag))
+    strings = sorted(index, key=index.get)
+    return strings, ids.tobytes()
+
+def decode_sentences(strings, ids):
+    """
+    Arguments
+    ---------
+    strings : list of str
+        String table
+    ids : bytes
+        Return of encode_sentences
+
+    Returns
+    -------
+    sents : list of tuple
+        Each tuple is (eojeols, list of list of (morph, tag))
+    """
+    flat = array('I')
+    flat.frombytes(ids)
+    sents = []
+    i, n = 0, len(flat)
+    while i < n:
+        n_eojeols = flat[i]
+        i += 1
+        eojeols, list_of_morphtags = [], []
+        for _ in range(n_eojeols):
+            eojeols.append(strings[flat[i]])
+            n_morphs = flat[i+1]
+            i += 2
+            list_of_morphtags.append(
+                [(strings[flat[j]], strings[flat[j+1]]) for j in range(i, i + 2 * n_morphs, 2)])
+            i += 2 * n_morphs
+        sents.append((eojeols, list_of_morphtags))
+    return sents
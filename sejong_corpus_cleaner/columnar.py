@@ -0,0 +1,253 @@
+from array import array
+import copy
+import json
+import mmap
+import os
+import sys
+
+from .loader import MorphTag
+from .loader import Sentence
+
+
+columnar_version = 1
+id_type = 'I'
+offset_type = 'Q'
+# (file name, array type)
+columns = [
+    ('eojeol_ids', id_type),
+    ('morph_ids', id_type),
+    ('tag_ids', id_type),
+    ('sent_offsets', offset_type),
+    ('eojeol_offsets', offset_type),
+]
+vocabularies = ['eojeols', 'morphs', 'tags']
+
+
+class ColumnarCorpus:
+    """
+    Reader of columnar corpus written by write_columnar_corpus.
+    Integer columns are memory-mapped, so it loads only vocabularies into memory.
+
+    Arguments
+    ---------
+    dirname : str
+        Columnar corpus directory
+
+    Usage
+    -----
+        >>> corpus = ColumnarCorpus('../data/clean/corpus_type1_all')
+        >>> len(corpus)
+        $ 1021527
+
+        >>> corpus[0]
+        $ 프랑스의	프랑스/Noun + 의/Josa
+          ...
+
+        >>> for sent in corpus[:100]:
+        >>>     # do something
+
+    A slice is a view sharing the memory-mapped columns. Closing the view does nothing,
+    and the view is not available after the corpus is closed.
+    """
+    def __init__(self, dirname):
+        with open('{}/meta.json'.format(dirname), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['version'] != columnar_version:
+            raise ValueError('Not supported columnar corpus version {}'.format(meta['version']))
+        if meta['byteorder'] != sys.byteorder:
+            raise ValueError('Columnar corpus is written with {} endian'.format(meta['byteorder']))
+
+        self.dirname = dirname
+        self.begin = 0
+        self.end = meta['n_sents']
+        self._is_view = False
+        self._mmaps = []
+        for name, typecode in columns:
+            setattr(self, name, self._mmap_column(name, typecode))
+        for name in vocabularies:
+            with open('{}/{}.txt'.format(dirname, name), encoding='utf-8', newline='') as f:
+                text = f.read()
+            setattr(self, name, text.split('\n')[:-1] if text else [])
+        self._morphtags = {}
+
+    def _mmap_column(self, name, typecode):
+        path = '{}/{}.bin'.format(self.dirname, name)
+        if os.path.getsize(path) == 0:
+            return array(typecode)
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmaps.append(buffer)
+        return memoryview(buffer).cast(typecode)
+
+    def close(self):
+        if self._is_view:
+            return
+        for name, typecode in columns:
+            column = getattr(self, name)
+            if isinstance(column, memoryview):
+                column.release()
+        for buffer in self._mmaps:
+            buffer.close()
+        self._mmaps = []
+
+    def __len__(self):
+        return self.end - self.begin
+
+    def __iter__(self):
+        for i in range(self.begin, self.end):
+            yield self._get(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            begin, end, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError('ColumnarCorpus supports only continuous slicing')
+            # the view shares memory-mapped columns and vocabularies
+            view = copy.copy(self)
+            view._is_view = True
+            view.begin = self.begin + begin
+            view.end = self.begin + max(begin, end)
+            return view
+        if index < 0:
+            index += len(self)
+        if not (0 <= index < len(self)):
+            raise IndexError('ColumnarCorpus index out of range')
+        return self._get(self.begin + index)
+
+    def _morphtag(self, morph_id, tag_id):
+        # share a MorphTag instance for each (morph, tag)
+        key = (morph_id, tag_id)
+        morphtag = self._morphtags.get(key)
+        if morphtag is None:
+            morphtag = MorphTag(self.morphs[morph_id], self.tags[tag_id])
+            self._morphtags[key] = morphtag
+        return morphtag
+
+    def _get(self, i):
+        b, e = self.sent_offsets[i], self.sent_offsets[i+1]
+        eojeols = [self.eojeols[eojeol_id] for eojeol_id in self.eojeol_ids[b:e]]
+        eojeol_offsets = self.eojeol_offsets[b:e+1]
+        morph_ids, tag_ids = self.morph_ids, self.tag_ids
+        morphtags = [[self._morphtag(morph_ids[k], tag_ids[k]) for k in range(eojeol_offsets[j], eojeol_offsets[j+1])]
+                     for j in range(e - b)]
+        return Sentence(eojeols, morphtags)
+
+def is_columnar_corpus(path):
+    """
+    Argument
+    --------
+    path : str
+        File or directory path
+
+    Returns
+    -------
+    flag : Boolean
+        True if the path is a directory written by write_columnar_corpus
+    """
+    return os.path.isdir(path) and os.path.exists('{}/meta.json'.format(path))
+
+def write_columnar_corpus(sentences, dirname, buffer_size=1048576, vocabulary=None):
+    """
+    Arguments
+    ---------
+    sentences : list of Sentence or Sentences
+        Iterable object consists with Sentence instance
+    dirname : str
+        Output directory
+    buffer_size : int
+        Number of ids kept in memory for each column before flushing them to file
+    vocabulary : Vocabulary or None
+        If not None, the eojeol, morpheme and tag ids of the vocabulary are used,
+        so columnar corpora written with the same vocabulary share the ids
+
+    It writes the files below to dirname
+
+        meta.json : version, byte order and number of sentences, eojeols and morphemes
+        eojeols.txt, morphs.txt, tags.txt : vocabularies. A line is a string and the line number is its id
+        eojeol_ids.bin : eojeol id for each eojeol
+        morph_ids.bin, tag_ids.bin : morpheme id and tag id for each morpheme
+        sent_offsets.bin : the first eojeol position of each sentence, and the number of eojeols
+        eojeol_offsets.bin : the first morpheme position of each eojeol, and the number of morphemes
+
+    Usage
+    -----
+        >>> sents = Sentences('../data/clean/corpus_type1_all.txt', processed=True)
+        >>> write_columnar_corpus(sents, '../data/clean/corpus_type1_all')
+    """
+    os.makedirs(dirname, exist_ok=True)
+    indices = {name: {} for name in vocabularies}
+    def encode(name, s):
+        index = indices[name]
+        i = index.get(s)
+        if i is None:
+            i = len(index)
+            index[s] = i
+        return i
+
+    if vocabulary is not None:
+        encoders = {
+            'eojeols': vocabulary.encode_eojeol,
+            'morphs': vocabulary.encode_morph,
+            'tags': vocabulary.encode_tag
+        }
+        def encode(name, s):
+            return encoders[name](s)
+
+    def encode_sentence(sent):
+        if vocabulary is not None and getattr(sent, 'table', None) is vocabulary:
+            # CompactSentence of the vocabulary is written without decoding
+            for eojeol_id, morphtag_ids in sent.iter_ids():
+                yield eojeol_id, [vocabulary.morphtag_ids[i] for i in morphtag_ids]
+            return
+        for eojeol, morphtags in sent:
+            yield encode('eojeols', eojeol), [(encode('morphs', morph), encode('tags', tag)) for morph, tag in morphtags]
+
+    buffers = {name: array(typecode) for name, typecode in columns}
+    files = {name: open('{}/{}.bin'.format(dirname, name), 'wb') for name, _ in columns}
+
+    def flush(force=False):
+        for name, buffer in buffers.items():
+            if force or len(buffer) >= buffer_size:
+                buffer.tofile(files[name])
+                del buffer[:]
+
+    n_sents, n_eojeols, n_morphs = 0, 0, 0
+    try:
+        buffers['sent_offsets'].append(0)
+        buffers['eojeol_offsets'].append(0)
+        for sent in sentences:
+            for eojeol_id, morph_tag_ids in encode_sentence(sent):
+                buffers['eojeol_ids'].append(eojeol_id)
+                for morph_id, tag_id in morph_tag_ids:
+                    buffers['morph_ids'].append(morph_id)
+                    buffers['tag_ids'].append(tag_id)
+                n_morphs += len(morph_tag_ids)
+                n_eojeols += 1
+                buffers['eojeol_offsets'].append(n_morphs)
+            n_sents += 1
+            buffers['sent_offsets'].append(n_eojeols)
+            flush()
+        flush(force=True)
+    finally:
+        for f in files.values():
+            f.close()
+
+    for name, index in indices.items():
+        if vocabulary is None:
+            strings = sorted(index, key=index.get)
+        else:
+            strings = getattr(vocabulary, name)
+        with open('{}/{}.txt'.format(dirname, name), 'w', encoding='utf-8', newline='') as f:
+            for s in strings:
+                f.write('{}\n'.format(s))
+
+    meta = {
+        'version': columnar_version,
+        'byteorder': sys.byteorder,
+        'n_sents': n_sents,
+        'n_eojeols': n_eojeols,
+        'n_morphs': n_morphs
+    }
+    with open('{}/meta.json'.format(dirname), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    print('{} sentences has been written at {} as columnar format'.format(n_sents, dirname))
@@ -0,0 +1,145 @@
+from array import array
+
+from .loader import remove_empty_items
+from .vocabulary import Vocabulary
+
+
+# shared by CompactSentence instances created without table
+default_table = Vocabulary()
+
+
+class CompactSentence:
+    """
+    Memory compact version of Sentence.
+    It stores interned ids in one unsigned int array, and it creates
+    eojeols and MorphTag lists only when they are accessed.
+    The array consists with
+        [n_eojeols, eojeol ids, morpheme offsets (n_eojeols + 1), morphtag ids]
+
+    Arguments
+    ---------
+    list_of_eojeol : list of str
+        List of eojeol
+    list_of_morphtags : list of list of MorphTag
+        Its length is same to that of eojeols. (morph, tag) tuples are also available
+    table : Vocabulary or None
+        If None, it uses the vocabulary shared by all CompactSentence instances
+
+    Usage
+    -----
+        >>> sentence = CompactSentence(eojeols, morphtags)
+        >>> sentence[1]
+        $ ('세계적인', [세계/NNG, 적/XSN, 이/VCP, ㄴ/ETM])
+
+        >>> sents = [CompactSentence.from_sentence(sent) for sent in Sentences(paths)]
+    """
+    __slots__ = ('table', 'ids')
+
+    def __init__(self, list_of_eojeol, list_of_morphtags, table=None):
+        if table is None:
+            table = default_table
+        eojeols, list_of_morphtags = remove_empty_items(list_of_eojeol, list_of_morphtags)
+        n = len(eojeols)
+        ids = array('I', [n])
+        ids.extend(table.encode_eojeol(eojeol) for eojeol in eojeols)
+        offset = 0
+        ids.append(offset)
+        for morphtags in list_of_morphtags:
+            offset += len(morphtags)
+            ids.append(offset)
+        for morphtags in list_of_morphtags:
+            ids.extend(table.encode_morphtag(morph, tag) for morph, tag in morphtags)
+        self.table = table
+        self.ids = ids
+
+    @classmethod
+    def from_sentence(cls, sentence, table=None):
+        """
+        Arguments
+        ---------
+        sentence : Sentence
+            Or iterable of (eojeol, list of (morph, tag))
+        table : Vocabulary or None
+            If None, it uses the shared vocabulary
+
+        Returns
+        -------
+        sentence : CompactSentence
+        """
+        eojeols, list_of_morphtags = [], []
+        for eojeol, morphtags in sentence:
+            eojeols.append(eojeol)
+            list_of_morphtags.append(morphtags)
+        return cls(eojeols, list_of_morphtags, table)
+
+    def iter_ids(self):
+        """
+        Yields
+        ------
+        (eojeol id, tuple of morphtag ids)
+            The ids of the table
+        """
+        ids, n = self.ids, self.ids[0]
+        base = 2 + 2 * n
+        for i in range(n):
+            yield ids[1 + i], tuple(ids[base + ids[1 + n + i]: base + ids[2 + n + i]])
+
+    def morphtag_ids(self):
+        """
+        Returns
+        -------
+        array of unsigned int
+            Morphtag ids of all eojeols in the sentence
+        """
+        return self.ids[2 + 2 * self.ids[0]:]
+
+    def _eojeol(self, i):
+        return self.table.eojeol(self.ids[1 + i])
+
+    def _morphtags(self, i):
+        ids, n = self.ids, self.ids[0]
+        base = 2 + 2 * n
+        b, e = ids[1 + n + i], ids[2 + n + i]
+        morphtag = self.table.morphtag
+        return [morphtag(ids[j]) for j in range(base + b, base + e)]
+
+    @property
+    def eojeols(self):
+        return [self._eojeol(i) for i in range(len(self))]
+
+    @property
+    def morphtags(self):
+        return [self._morphtags(i) for i in range(len(self))]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._eojeol(i), self._morphtags(i)
+
+    def __len__(self):
+        return self.ids[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            return [self._eojeol(i) for i in indices], [self._morphtags(i) for i in indices]
+        if index < 0:
+            index += len(self)
+        if not (0 <= index < len(self)):
+            raise IndexError('CompactSentence index out of range')
+        return self._eojeol(index), self._morphtags(index)
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __repr__(self):
+        strf = '\n'.join(
+            '%s\t%s' % (eojeol, ' + '.join(str(mt) for mt in morphtags)) for eojeol, morphtags in self)
+        strf += '\n'
+        return strf
+
+    def get_morphtags(self, flatten=False):
+        if not flatten:
+            return self.morphtags
+        n = len(self)
+        morphtag = self.table.morphtag
+        return [morphtag(i) for i in self.ids[2 + 2 * n:]]
@@ -0,0 +1,199 @@
+from array import array
+
+from .vocabulary import Vocabulary
+
+
+class CompactCounter:
+    """
+    Counter of (eojeol, morphtags) pairs or morphemes keyed by the integer ids of Vocabulary.
+    A pair is stored as the bytes of its unsigned int id sequence [eojeol id, morphtag ids],
+    and the frequencies are stored in one unsigned long long array.
+    A morpheme counter stores the frequency of each morphtag id directly, without any key object.
+    Keys are kept in the order of their first appearance as same as dict.
+    Looking up a key does not add it to the vocabulary.
+
+    Arguments
+    ---------
+    vocabulary : Vocabulary or None
+        Interning table. If None, it creates new one
+    morphemes : Boolean
+        If True, the key is MorphTag. Else, the key is (eojeol, tuple of MorphTag)
+
+    Usage
+    -----
+        >>> counter = CompactCounter(vocabulary)
+        >>> for sent in sents:
+        >>>     counter.add_sentence(sent)
+        >>> counter[('세계적인', (세계/NNG, 적/XSN, 이/VCP, ㄴ/ETM))]
+        $ 3
+        >>> counter.most_common(2)
+        $ [(('등', (등/NNB,)), 20), (('있다', (있/VA, 다/EF)), 19)]
+
+        >>> morph_counter = CompactCounter(vocabulary, morphemes=True)
+        >>> for sent in sents:
+        >>>     morph_counter.add_morphemes(sent)
+        >>> morph_counter.to_dict()
+    """
+    def __init__(self, vocabulary=None, morphemes=False):
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+        self.vocabulary = vocabulary
+        self.morphemes = morphemes
+        self.counts = array('Q')
+        # pairs : packed id sequences and {packed ids: slot}
+        # morphemes : counts are indexed by morphtag id, and the ids are kept in order
+        self._keys = []
+        self._index = {}
+        self._order = array('I')
+        # morphemes : 1 if the morphtag id is in _order
+        self._exists = bytearray()
+
+    def __len__(self):
+        if self.morphemes:
+            return len(self._order)
+        return len(self._keys)
+
+    def _pack(self, eojeol_id, morphtag_ids):
+        ids = array('I', [eojeol_id])
+        ids.extend(morphtag_ids)
+        return ids.tobytes()
+
+    def _unpack(self, key):
+        ids = array('I')
+        ids.frombytes(key)
+        return ids[0], ids[1:]
+
+    def _pair_slot(self, key):
+        slot = self._index.get(key)
+        if slot is None:
+            slot = len(self._keys)
+            self._index[key] = slot
+            self._keys.append(key)
+            self.counts.append(0)
+        return slot
+
+    def _morphtag_slot(self, i):
+        counts = self.counts
+        if i >= len(counts):
+            n = max(i + 1, 2 * len(counts)) - len(counts)
+            counts.extend(array('Q', [0]) * n)
+            self._exists.extend(bytes(n))
+        if not self._exists[i]:
+            self._exists[i] = 1
+            self._order.append(i)
+        return i
+
+    def add_sentence(self, sentence):
+        """
+        Argument
+        --------
+        sentence : Sentence or CompactSentence
+            The ids of CompactSentence sharing the vocabulary are used without decoding
+        """
+        if self.morphemes:
+            self.add_morphemes(sentence)
+            return
+        pack, slot, counts = self._pack, self._pair_slot, self.counts
+        for eojeol_id, morphtag_ids in self.vocabulary.encode_sentence(sentence):
+            counts[slot(pack(eojeol_id, morphtag_ids))] += 1
+
+    def add_morphemes(self, sentence):
+        """
+        Argument
+        --------
+        sentence : Sentence or CompactSentence
+            It counts morphemes directly, without (eojeol, morphtags) pairs
+        """
+        if not self.morphemes:
+            raise ValueError('add_morphemes is available only when morphemes=True')
+        slot, counts = self._morphtag_slot, self.counts
+        if getattr(sentence, 'table', None) is self.vocabulary:
+            for i in sentence.morphtag_ids():
+                counts[slot(i)] += 1
+            return
+        encode = self.vocabulary.encode_morphtag
+        for _, morphtags in sentence:
+            for morph, tag in morphtags:
+                counts[slot(encode(morph, tag))] += 1
+
+    def _encode_key(self, key):
+        if self.morphemes:
+            return self.vocabulary.encode_morphtag(*key)
+        eojeol_id, morphtag_ids = self.vocabulary.encode_eojeol_morphtags(*key)
+        return self._pack(eojeol_id, morphtag_ids)
+
+    def _find_key(self, key):
+        if self.morphemes:
+            return self.vocabulary.find_morphtag(*key)
+        ids = self.vocabulary.find_eojeol_morphtags(*key)
+        return None if ids is None else self._pack(*ids)
+
+    def __getitem__(self, key):
+        key = self._find_key(key)
+        if key is None:
+            return 0
+        if self.morphemes:
+            return self.counts[key] if key < len(self.counts) else 0
+        slot = self._index.get(key)
+        return 0 if slot is None else self.counts[slot]
+
+    def __setitem__(self, key, count):
+        key = self._encode_key(key)
+        if self.morphemes:
+            self.counts[self._morphtag_slot(key)] = count
+        else:
+            self.counts[self._pair_slot(key)] = count
+
+    def __iter__(self):
+        return self.keys()
+
+    def keys(self):
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        for _, count in self.items():
+            yield count
+
+    def items(self):
+        """
+        Yields
+        ------
+        (key, frequency)
+            In the order of the first appearance of keys
+        """
+        vocabulary = self.vocabulary
+        if self.morphemes:
+            morphtag, counts = vocabulary.morphtag, self.counts
+            for i in self._order:
+                yield morphtag(i), counts[i]
+            return
+        for key, count in zip(self._keys, self.counts):
+            eojeol_id, morphtag_ids = self._unpack(key)
+            yield vocabulary.decode_eojeol_morphtags((eojeol_id, morphtag_ids)), count
+
+    def most_common(self, n=None):
+        """
+        Argument
+        --------
+        n : int or None
+            Number of returned items. If None, it returns all items
+
+        Returns
+        -------
+        list of (key, frequency)
+            Sorted by frequency in decreasing order. Ties keep the order of the first appearance
+        """
+        if self.morphemes:
+            slots = sorted(self._order, key=lambda i: -self.counts[i])
+        else:
+            slots = sorted(range(len(self._keys)), key=lambda i: -self.counts[i])
+        if n is not None:
+            slots = slots[:n]
+        vocabulary = self.vocabulary
+        if self.morphemes:
+            return [(vocabulary.morphtag(i), self.counts[i]) for i in slots]
+        return [(vocabulary.decode_eojeol_morphtags(self._unpack(self._keys[i])), self.counts[i]) for i in slots]
+
+    def to_dict(self):
+        return dict(self.items())
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import pickle
+import zlib
+
+from .utils import cache_dir as default_cache_dir
+
+
+counter_cache_version = 1
+
+
+class CounterCache:
+    """
+    Persistent counters of each corpus file.
+    The key is the sha1 hash of file content, file name and counting options, so a counter is
+    reused until they change, regardless of the directory and modified time.
+    The file name is included because raw file parsing depends on it.
+    A counter is stored as the list of (key, frequency) in a zlib compressed file.
+
+    Arguments
+    ---------
+    cache_dir : str or None
+        Cache directory. If None, it uses '../data/cache/counter/'
+
+    Attributes
+    ----------
+    n_hits : int
+        Number of cache hits
+    n_misses : int
+        Number of cache misses
+
+    Usage
+    -----
+        >>> cache = CounterCache('../data/cache/counter/')
+        >>> counter = make_counter_incrementally(paths, cache, convert_lr=True)
+    """
+    def __init__(self, cache_dir=None):
+        if cache_dir is None:
+            cache_dir = default_cache_dir + 'counter'
+        self.cache_dir = cache_dir
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def key(self, path, *options):
+        """
+        Arguments
+        ---------
+        path : str
+            Corpus file path
+        options : str
+            Counting options such as convert_lr, noun_xsv_as_verb, xsv_as_root and parser
+
+        Returns
+        -------
+        key : str
+            sha1 hex digest
+        """
+        # is_colloquial_file and the sentence filter of written files use the file name
+        source = [file_digest(path), os.path.basename(path), str(counter_cache_version)]
+        key = '|'.join(source + [str(option) for option in options])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _cache_path(self, key):
+        return '{}/{}.counter'.format(self.cache_dir, key)
+
+    def exists(self, key):
+        return os.path.exists(self._cache_path(key))
+
+    def load(self, key):
+        """
+        Argument
+        --------
+        key : str
+            Return of CounterCache.key
+
+        Returns
+        -------
+        items : list of (key, frequency) or None
+            In the order of the first appearance in the file
+            It returns None if the key does not exist
+        """
+        try:
+            with open(self._cache_path(key), 'rb') as f:
+                items = pickle.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, zlib.error):
+            self.n_misses += 1
+            return None
+        self.n_hits += 1
+        return items
+
+    def save(self, key, items):
+        """
+        Arguments
+        ---------
+        key : str
+            Return of CounterCache.key
+        items : list of (key, frequency)
+            Counter of a file
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data = zlib.compress(pickle.dumps(list(items), protocol=pickle.HIGHEST_PROTOCOL))
+        path = self._cache_path(key)
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+def file_digest(path):
+    """
+    Argument
+    --------
+    path : str
+        File path
+
+    Returns
+    -------
+    digest : str
+        sha1 hex digest of file content
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,208 @@
+import heapq
+from itertools import islice
+import os
+import shutil
+import tempfile
+import weakref
+
+from .loader import MorphTag
+
+
+class ExternalCounter:
+    """
+    Counter which keeps at most max_keys distinct keys in memory.
+    When the budget is hit, the partial counts are sorted by key and flushed to a run file.
+    most_common merges the runs with k-way merge, sums the counts of each key,
+    and sorts them by frequency with external merge sort, so the whole table is never
+    loaded in memory.
+    The run files are removed by close, at the end of `with` statement,
+    or when the counter is garbage collected.
+
+    Keys are stored as the strings of the counter file
+
+        (eojeol, morphtags) : eojeol\\tmorph/tag + morph/tag
+        MorphTag : morph/tag
+
+    The first appearance of each key is also stored, so ties of frequency keep
+    the order of the first appearance as same as dict.
+
+    Arguments
+    ---------
+    max_keys : int
+        Maximum number of distinct keys in memory. Default is 1000000
+    temp_dir : str or None
+        Directory of run files. If None, it uses the system temporary directory
+    max_runs : int
+        Maximum number of run files opened at once. When there are more runs,
+        each group of max_runs runs is merged into one run first. Default is 64
+
+    Attributes
+    ----------
+    n_runs : int
+        Number of run files
+    n_total : int
+        Sum of all added counts
+
+    Usage
+    -----
+        >>> with ExternalCounter(max_keys=100000) as counter:
+        >>>     for sent in sents:
+        >>>         for eojeol, morphtags in sent:
+        >>>             counter.add((eojeol, tuple(morphtags)))
+        >>>     counter.write('counter_sejong_pair_all.txt')
+    """
+    def __init__(self, max_keys=1000000, temp_dir=None, max_runs=64):
+        if max_keys <= 0:
+            raise ValueError('max_keys must be positive but {}'.format(max_keys))
+        if max_runs < 2:
+            raise ValueError('max_runs must be larger than 1 but {}'.format(max_runs))
+        self.max_keys = max_keys
+        self.max_runs = max_runs
+        self.temp_dir = tempfile.mkdtemp(prefix='sejong_counter_', dir=temp_dir)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.temp_dir, True)
+        self.n_runs = 0
+        self.n_total = 0
+        self._n_added = 0
+        # {key string: [first appearance, count]}
+        self._buffer = {}
+        self._runs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Removes the run files"""
+        self._finalizer()
+        self._runs = []
+
+    def add(self, key, count=1):
+        """
+        Arguments
+        ---------
+        key : (eojeol, tuple of MorphTag), MorphTag or str
+            str is used as the key string without encoding
+        count : int
+            Frequency added to the key
+        """
+        key = encode_key(key)
+        value = self._buffer.get(key)
+        if value is None:
+            if len(self._buffer) >= self.max_keys:
+                self.flush()
+            self._buffer[key] = [self._n_added, count]
+        else:
+            value[1] += count
+        self._n_added += 1
+        self.n_total += count
+
+    def flush(self):
+        """Writes the keys in memory to a run file sorted by key string"""
+        if not self._buffer:
+            return
+        items = sorted((key, first, count) for key, (first, count) in self._buffer.items())
+        self._runs.append(self._write_run(items))
+        self._buffer = {}
+
+    def _write_run(self, items):
+        path = '{}/run{}.txt'.format(self.temp_dir, self.n_runs)
+        self.n_runs += 1
+        with open(path, 'w', encoding='utf-8') as f:
+            for item in items:
+                f.write('{}\t{}\t{}\n'.format(*item))
+        return path
+
+    def _merge_passes(self, paths, merge):
+        # merges groups of runs until all runs can be opened at once
+        max_runs = self.max_runs
+        while len(paths) > max_runs:
+            merged_paths = []
+            for b in range(0, len(paths), max_runs):
+                group = paths[b: b + max_runs]
+                merged_paths.append(self._write_run(merge(group)))
+                for path in group:
+                    os.remove(path)
+            paths = merged_paths
+        return paths
+
+    def _merge_runs(self, paths, parse):
+        files = [open(path, encoding='utf-8') for path in paths]
+        try:
+            for item in heapq.merge(*[(parse(line) for line in f) for f in files]):
+                yield item
+        finally:
+            for f in files:
+                f.close()
+
+    def _merged_by_key(self, paths):
+        previous = None
+        for key, first, count in self._merge_runs(paths, _parse_key_first_count):
+            if previous is not None and previous[0] == key:
+                previous[1] = min(previous[1], first)
+                previous[2] += count
+                continue
+            if previous is not None:
+                yield previous
+            previous = [key, first, count]
+        if previous is not None:
+            yield previous
+
+    def most_common(self):
+        """
+        Yields
+        ------
+        (key string, frequency)
+            Sorted by frequency in decreasing order. Ties keep the order of the first appearance
+        """
+        self.flush()
+        self._runs = self._merge_passes(self._runs, self._merged_by_key)
+        merged = self._merged_by_key(self._runs)
+        runs = []
+        merge = lambda paths: self._merge_runs(paths, _parse_count_first_key)
+        while True:
+            items = sorted((-count, first, key) for key, first, count in islice(merged, self.max_keys))
+            if not items:
+                break
+            runs.append(self._write_run(items))
+        runs = self._merge_passes(runs, merge)
+        try:
+            for count, _, key in merge(runs):
+                yield key, -count
+        finally:
+            for path in runs:
+                os.remove(path)
+
+    def __len__(self):
+        """Number of distinct keys. It merges the run files"""
+        self.flush()
+        self._runs = self._merge_passes(self._runs, self._merged_by_key)
+        return sum(1 for _ in self._merged_by_key(self._runs))
+
+    def write(self, path):
+        """
+        Argument
+        --------
+        path : str
+            Counter file path. Each line is "key string\\tfrequency"
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for key, count in self.most_common():
+                f.write('{}\t{}\n'.format(key, count))
+
+def _parse_key_first_count(line):
+    key, first, count = line[:-1].rsplit('\t', 2)
+    return key, int(first), int(count)
+
+def _parse_count_first_key(line):
+    count, first, key = line[:-1].split('\t', 2)
+    return int(count), int(first), key
+
+def encode_key(key):
+    if isinstance(key, str):
+        return key
+    if isinstance(key, MorphTag):
+        return str(key)
+    eojeol, morphtags = key
+    return '{}\t{}'.format(eojeol, ' + '.join(str(m) for m in morphtags))
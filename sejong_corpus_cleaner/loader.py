@@ -1,14 +1,29 @@
+from bisect import bisect_right
+from collections import deque
 from collections import namedtuple
 from bs4 import BeautifulSoup
+from functools import partial
 from glob import glob
+from itertools import islice
+from multiprocessing import Pool
+from multiprocessing import cpu_count
+import html
 import os
+import re
 
+from .cache import ParseCache
 from .format_checker import check_sejong_tagset
+from .format_checker import sejong_tagset
+from .manifest import Manifest
+from .manifest import count_a_sentences_file
 from .utils import unicode_sentence
 from .utils import data_dir as default_data_dir
 
 
 sep = os.path.sep
+parsers = {'soup', 'stream'}
+# Increase it when the parsing rules change. It invalidates ParseCache entries
+parser_version = 1
 
 
 class MorphTag(namedtuple('MorphTag', 'morph tag')):
@@ -102,24 +117,7 @@ class Sentence:
            ...
     """
     def __init__(self, list_of_eojeol, list_of_morphtags):
-
-        assert len(list_of_eojeol) == len(list_of_morphtags)
-
-        def preprocessing(list_of_eojeol, list_of_morphtags):
-            eojeols_ = []
-            morphtags_ = []
-            for eojeol, morphtags in zip(list_of_eojeol, list_of_morphtags):
-                if (not eojeol) and ((not morphtags) or (morphtags[0] is None)):
-                    continue
-                if eojeol and (morphtags and morphtags[0] is not None):
-                    eojeols_.append(eojeol)
-                    morphtags_.append(morphtags)
-                else:
-                    raise ValueError('Exist empty item in sequence\neojeols = {}\nmorphtags = {}'.format(
-                        list_of_eojeol, list_of_morphtags))
-            return eojeols_, morphtags_
-
-        self.eojeols, self.morphtags = preprocessing(list_of_eojeol, list_of_morphtags)
+        self.eojeols, self.morphtags = remove_empty_items(list_of_eojeol, list_of_morphtags)
 
     def __iter__(self):
         for eojeol, morphtags in zip(self.eojeols, self.morphtags):
@@ -147,6 +145,27 @@ class Sentence:
         return [mt for mts in self.morphtags for mt in mts]
 
 
+def remove_empty_items(list_of_eojeol, list_of_morphtags):
+    """
+    It removes the items of which both eojeol and morphtags are empty.
+    It raises ValueError if only one of them is empty.
+    """
+    assert len(list_of_eojeol) == len(list_of_morphtags)
+
+    eojeols_ = []
+    morphtags_ = []
+    for eojeol, morphtags in zip(list_of_eojeol, list_of_morphtags):
+        if (not eojeol) and ((not morphtags) or (morphtags[0] is None)):
+            continue
+        if eojeol and (morphtags and morphtags[0] is not None):
+            eojeols_.append(eojeol)
+            morphtags_.append(morphtags)
+        else:
+            raise ValueError('Exist empty item in sequence\neojeols = {}\nmorphtags = {}'.format(
+                list_of_eojeol, list_of_morphtags))
+    return eojeols_, morphtags_
+
+
 class Sentences:
     """
     Arguments
@@ -158,54 +177,364 @@ class Sentences:
     processed : Boolean
         If False, it loads raw Sejong corpus file
         Else, it loads processed corpus file
+        A directory written by write_columnar_corpus is loaded as ColumnarCorpus
     num_sents : int
         Maximum number of sentences
         If the value is negative, it loads all sentences
+    parser : str
+        Raw Sejong corpus parser backend. Available : ['soup', 'stream']
+        It is used only when processed is False
+        Default is 'soup'
+    n_jobs : int
+        Number of worker processes parsing raw Sejong corpus files
+        If the value is negative, it uses all cores
+        Sentences are yielded in the order of file_paths regardless of n_jobs
+        Default is 1
+    cache : ParseCache, str or None
+        If not None, parsed raw Sejong corpus files are stored to and loaded from the cache
+        If str, it is used as the cache directory
+        It is used only when processed is False and num_sents is negative
+        Default is None
+    manifest : Manifest, str or None
+        Per-file sentence and error counts used by __len__ and plan_files
+        The counts are recorded while iterating or counting files
+        If str, it is used as the manifest file path and the counts are persisted
+        If None, the counts are kept only in memory
+        Default is None
+    shard_id : int
+        Index of the shard to iterate, 0 <= shard_id < num_shards
+        Default is 0
+    num_shards : int
+        Number of disjoint shards. Each consumer iterates only its shard.
+        num_sents and __len__ are applied to the shard
+        Default is 1
+    shard_by : str
+        Available : ['auto', 'file', 'sentence']
+        'file' assigns file_paths[shard_id::num_shards] to the shard.
+        'sentence' splits the sentences of processed corpus files into num_shards continuous ranges
+        using IndexedSentences or ColumnarCorpus, so only the range of the shard is parsed.
+        'auto' uses 'file' if the number of files is not less than num_shards or the files are raw
+        Default is 'auto'
+    resume_cursor : tuple or None
+        The cursor attribute saved from an interrupted iteration of the same shard.
+        If not None, iteration continues from the cursor instead of the beginning
+        Default is None
+    vocabulary : Vocabulary or None
+        If not None, it yields CompactSentence interned to the vocabulary
+        Default is None
+
+    Attributes
+    ----------
+    cursor : tuple
+        (segment index, sentence index in the segment, number of yielded sentences)
+        Position of the latest iteration. It is updated whenever a sentence is yielded,
+        and it becomes None when the iteration reaches the end.
     """
-    def __init__(self, file_paths=None, verbose=True, processed=False, num_sents=-1):
+    def __init__(self, file_paths=None, verbose=True, processed=False, num_sents=-1,
+        parser='soup', n_jobs=1, cache=None, manifest=None,
+        shard_id=0, num_shards=1, shard_by='auto', resume_cursor=None, vocabulary=None):
         if file_paths is None:
             file_paths = get_data_paths()
         if isinstance(file_paths, str):
             file_paths = [file_paths]
+        check_parser(parser)
 
         self.file_paths = file_paths
         self.verbose = verbose
         self.processed = processed
         self.num_sents = num_sents
+        self.parser = parser
+        self.n_jobs = cpu_count() if n_jobs < 0 else max(1, n_jobs)
+        if isinstance(cache, str):
+            cache = ParseCache(cache)
+        self.cache = cache
+        if manifest is None or isinstance(manifest, str):
+            manifest = Manifest(manifest)
+        self.manifest = manifest
+
+        if not (0 <= shard_id < num_shards):
+            raise ValueError('shard_id must be in [0, {}) but {}'.format(num_shards, shard_id))
+        if shard_by == 'auto':
+            shard_by = 'file' if (len(file_paths) >= num_shards or not processed) else 'sentence'
+        if not (shard_by in {'file', 'sentence'}):
+            raise ValueError('shard_by must be "auto", "file" or "sentence" but {}'.format(shard_by))
+        if shard_by == 'sentence' and not processed:
+            raise ValueError('Sharding by sentence supports only processed corpus files')
+        self.shard_id = shard_id
+        self.num_shards = num_shards
+        self.shard_by = shard_by
+        self.resume_cursor = tuple(resume_cursor) if resume_cursor is not None else None
+        self.cursor = None
+        self.vocabulary = vocabulary
+
+    def _intern(self, sent):
+        if self.vocabulary is None:
+            return sent
+        from .compact import CompactSentence
+        return CompactSentence.from_sentence(sent, self.vocabulary)
+
+    def _use_cache(self):
+        return (self.cache is not None) and (not self.processed) and (self.num_sents < 0)
+
+    def _manifest_option(self):
+        if self.processed:
+            return 'processed'
+        return 'raw|{}|{}'.format(self.parser, parser_version)
+
+    def plan_files(self):
+        """
+        Returns
+        -------
+        paths : list of str or None
+            The files needed to yield num_sents sentences, planned with the manifest
+            It returns None if the manifest does not know the counts of the files yet
+        """
+        return self.manifest.plan(self.file_paths, self._manifest_option(), self.num_sents)
+
+    def segments(self):
+        """
+        Returns
+        -------
+        segments : list of tuple
+            (path, begin, end) of the shard. The shard iterates sentences [begin, end) of each path,
+            and end is None if it iterates to the last sentence of the file.
+        """
+        if self.num_shards == 1:
+            return [(path, 0, None) for path in self.file_paths]
+        if self.shard_by == 'file':
+            return [(path, 0, None) for path in self.file_paths[self.shard_id::self.num_shards]]
+
+        readers = self._random_access_readers()
+        n = self._n_indexed
+        lo = n * self.shard_id // self.num_shards
+        hi = n * (self.shard_id + 1) // self.num_shards
+        segments = []
+        for path, (begin, reader) in zip(self.file_paths, readers):
+            b, e = max(lo, begin), min(hi, begin + len(reader))
+            if b < e:
+                segments.append((path, b - begin, e - begin))
+        return segments
+
+    def _load_files(self, segments, num_sents):
+        # yields (sents, n_errors, cache_hit)
+        if self.processed:
+            # columnar imports Sentence from this module
+            from .columnar import ColumnarCorpus, is_columnar_corpus
+            from .offset_index import IndexedSentences
+            for path, begin, end in segments:
+                if is_columnar_corpus(path):
+                    sents = ColumnarCorpus(path)[begin:end]
+                    if num_sents > 0:
+                        sents = sents[:num_sents]
+                elif begin == 0 and end is None:
+                    sents = iter_a_sentences_file(path, num_sents=num_sents)
+                else:
+                    if num_sents > 0:
+                        end = begin + num_sents if end is None else min(end, begin + num_sents)
+                    sents = IndexedSentences(path).iter_range(begin, end)
+                yield sents, 0, False
+            return
+
+        # raw files are segmented only by resume_cursor
+        first_begin = segments[0][1] if segments else 0
+        num_sents_ = num_sents + first_begin if (num_sents > 0) else num_sents
+        if self._use_cache():
+            load = partial(load_a_sejong_file_with_cache, cache=self.cache,
+                remain_dummy_morpheme=False, parser=self.parser)
+        else:
+            load = partial(load_a_sejong_file, remain_dummy_morpheme=False,
+                num_sents=num_sents_, parser=self.parser)
+        file_paths = [path for path, _, _ in segments]
+        if self.n_jobs == 1 or len(file_paths) == 1:
+            results = (load(path) for path in file_paths)
+        else:
+            results = parallel_load_files(file_paths, load, self.n_jobs)
+        for (_, begin, end), result in zip(segments, results):
+            if len(result) == 2:
+                result = result + (False,)
+            if begin > 0 or end is not None:
+                result = (result[0][begin:end],) + result[1:]
+            yield result
 
     def __iter__(self):
-        n_sents_, n_errors_, n_iters = 0, 0, 0
-        for i, path in enumerate(self.file_paths):
-            if self.num_sents > 0 and self.num_sents <= n_iters:
-                break
-
-            if not self.processed:
-                sents, n_errors = load_a_sejong_file(path,
-                    remain_dummy_morpheme=False, num_sents=self.num_sents)
+        try:
+            for sent in self._iter():
+                yield sent
+        finally:
+            self.manifest.save()
+
+    def _iter(self):
+        segments = self.segments()
+        if self.resume_cursor is None:
+            i_begin, j_begin, n_iters = 0, 0, 0
+            if self.num_shards == 1:
+                # the files after the planned ones are not loaded, because iteration stops before them
+                planned = self.plan_files()
+                if planned is not None:
+                    segments = segments[:len(planned)]
+        else:
+            i_begin, j_begin, n_iters = self.resume_cursor
+        n_segments = len(segments)
+        remains = [(path, begin + (j_begin if i == i_begin else 0), end)
+                   for i, (path, begin, end) in enumerate(segments) if i >= i_begin]
+        num_sents = self.num_sents - n_iters if self.num_sents > 0 else self.num_sents
+
+        n_sents_, n_errors_ = 0, 0
+        n_hits_, n_misses_ = 0, 0
+        option = self._manifest_option()
+        if num_sents == 0:
+            remains = []
+        self.cursor = (i_begin, j_begin, n_iters)
+        for i, ((path, begin, end), (sents, n_errors, cache_hit)) in enumerate(
+            zip(remains, self._load_files(remains, num_sents)), i_begin):
+            # processed corpus files are streamed, so they are counted while yielding
+            sized = hasattr(sents, '__len__')
+            if sized:
                 n_sents_ += len(sents)
-                n_errors_ += n_errors
+            n_errors_ += n_errors
+            if cache_hit:
+                n_hits_ += 1
             else:
-                sents = load_a_sentences_file(path, num_sents=self.num_sents)
-                n_sents_ += len(sents)
-
-            for sent in sents:
-                yield sent
+                n_misses_ += 1
+
+            n_file_sents = len(sents) if sized else 0
+            exhausted = True
+            # the sentence index in cursor is relative to the segment
+            for j, sent in enumerate(sents, begin - segments[i][1] + 1):
+                self.cursor = (i, j, n_iters + 1)
+                yield self._intern(sent)
                 n_iters += 1
+                if not sized:
+                    n_sents_ += 1
+                    n_file_sents += 1
                 if self.num_sents > 0 and self.num_sents <= n_iters:
+                    exhausted = False
                     break
 
+            # the counts are complete only when the whole file was not truncated by num_sents
+            whole_file = (begin == 0 and end is None)
+            if whole_file and (sized or exhausted) and (num_sents <= 0 or n_file_sents < num_sents):
+                self.manifest.set(path, option, n_file_sents, n_errors)
+            if exhausted:
+                self.cursor = (i + 1, 0, n_iters)
+
             if self.verbose:
-                args = (n_sents_, n_errors_, i+1, len(self.file_paths))
-                print('\rIterating {} sents + {} errors from {} / {} files'.format(*args), end='')
+                args = (n_sents_, n_errors_, i+1, n_segments, self._cache_strf(n_hits_, n_misses_))
+                print('\rIterating {} sents + {} errors from {} / {} files{}'.format(*args), end='')
+
+            if self.num_sents > 0 and self.num_sents <= n_iters:
+                break
+        else:
+            self.cursor = None
         if self.verbose:
-            args = (n_sents_, n_errors_, len(self.file_paths), ' '*20)
-            print('\rIterated {} sents + {} errors from {} files{}'.format(*args))
+            args = (n_sents_, n_errors_, n_segments, self._cache_strf(n_hits_, n_misses_), ' '*20)
+            print('\rIterated {} sents + {} errors from {} files{}{}'.format(*args))
+
+    def _cache_strf(self, n_hits, n_misses):
+        if not self._use_cache():
+            return ''
+        return ' (cache {} hits, {} misses)'.format(n_hits, n_misses)
+
+    def count_files(self):
+        """
+        Returns
+        -------
+        counts : list of tuple
+            (n_sents, n_errors) of each file. The counts come from the manifest,
+            and only the files which are not in the manifest are counted.
+            If num_sents is positive, it stops counting when the sum of n_sents reaches num_sents
+        """
+        option = self._manifest_option()
+        counts = []
+        n_sents = 0
+        for path in self.file_paths:
+            if self.num_sents > 0 and n_sents >= self.num_sents:
+                break
+            count = self.manifest.get(path, option)
+            if count is None:
+                count = self._count_a_file(path)
+                self.manifest.set(path, option, *count)
+            counts.append(count)
+            n_sents += count[0]
+        self.manifest.save()
+        return counts
+
+    def _count_a_file(self, path):
+        if self.processed:
+            from .columnar import ColumnarCorpus, is_columnar_corpus
+            if is_columnar_corpus(path):
+                return len(ColumnarCorpus(path)), 0
+            return count_a_sentences_file(path), 0
+        if self.cache is not None:
+            sents, n_errors, _ = load_a_sejong_file_with_cache(path, self.cache, parser=self.parser)
+        else:
+            sents, n_errors = load_a_sejong_file(path, parser=self.parser)
+        return len(sents), n_errors
 
     def __len__(self):
-        i = -1
-        for i, _ in enumerate(self.__iter__()):
-            continue
-        return i + 1
+        if self.num_shards == 1:
+            n_sents = sum(n for n, _ in self.count_files())
+        else:
+            option = self._manifest_option()
+            n_sents = 0
+            for path, begin, end in self.segments():
+                if end is None:
+                    count = self.manifest.get(path, option)
+                    if count is None:
+                        count = self._count_a_file(path)
+                        self.manifest.set(path, option, *count)
+                    end = count[0]
+                n_sents += end - begin
+            self.manifest.save()
+        if self.num_sents > 0:
+            n_sents = min(n_sents, self.num_sents)
+        return n_sents
+
+    def _random_access_readers(self):
+        # list of (begin index, reader), readers support __len__ and __getitem__
+        if not self.processed:
+            raise TypeError('Only processed corpus files support indexing')
+        if getattr(self, '_readers', None) is None:
+            from .columnar import ColumnarCorpus, is_columnar_corpus
+            from .offset_index import IndexedSentences
+            readers, begin = [], 0
+            for path in self.file_paths:
+                if is_columnar_corpus(path):
+                    reader = ColumnarCorpus(path)
+                else:
+                    reader = IndexedSentences(path)
+                readers.append((begin, reader))
+                begin += len(reader)
+            self._readers = readers
+            self._begins = [begin for begin, _ in readers]
+            self._n_indexed = begin
+        return self._readers
+
+    def __getitem__(self, index):
+        """
+        Random access to processed corpus files. Text files are indexed by IndexedSentences,
+        and directories written by write_columnar_corpus are read by ColumnarCorpus.
+
+        Argument
+        --------
+        index : int or slice
+            Sentence index over all file_paths
+
+        Returns
+        -------
+        Sentence, or list of Sentence if index is slice
+        """
+        readers = self._random_access_readers()
+        n = self._n_indexed if self.num_sents <= 0 else min(self._n_indexed, self.num_sents)
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(n))]
+        if index < 0:
+            index += n
+        if not (0 <= index < n):
+            raise IndexError('Sentences index out of range')
+        j = bisect_right(self._begins, index) - 1
+        begin, reader = readers[j]
+        return self._intern(reader[index - begin])
 
 
 def check_corpus_type(corpus_types):
@@ -229,6 +558,43 @@ def check_corpus_type(corpus_types):
             raise ValueError('Corpus type must be "colloquial" or "written" but {}'.format(ctype))
     return corpus_types
 
+def parallel_load_files(paths, load, n_jobs):
+    """
+    Arguments
+    ---------
+    paths : list of str
+        File paths
+    load : callable
+        Picklable function which takes a path and returns (sents, n_errors)
+    n_jobs : int
+        Number of worker processes
+
+    Yields
+    ------
+    (sents, n_errors) : tuple
+        The results of load in the order of paths.
+        At most 2 * n_jobs files are parsed ahead of the consumer.
+    """
+    paths = iter(paths)
+    with Pool(n_jobs) as pool:
+        pending = deque(pool.apply_async(load, (path,)) for path in islice(paths, 2 * n_jobs))
+        while pending:
+            result = pending.popleft().get()
+            for path in islice(paths, 1):
+                pending.append(pool.apply_async(load, (path,)))
+            yield result
+
+def check_parser(parser):
+    """
+    Argument
+    --------
+    parser : str
+        Available : ['soup', 'stream']
+    """
+    if not (parser in parsers):
+        raise ValueError('Parser must be "soup" or "stream" but {}'.format(parser))
+    return parser
+
 def get_data_paths(corpus_types=None, data_dir=None):
     """
     Arguments
@@ -255,7 +621,7 @@ def get_data_paths(corpus_types=None, data_dir=None):
         raise ValueError('File not founded from {}'.format(data_dir))
     return paths
 
-def load_a_sentences_file(path, num_sents=-1):
+def load_a_sentences_file(path, num_sents=-1, compact=False, vocabulary=None):
     """
     Arguments
     ---------
@@ -264,38 +630,96 @@ def load_a_sentences_file(path, num_sents=-1):
     num_sents : int
         Maximum number of sentences
         If the value is negative, it loads all sentences
+    compact : Boolean
+        If True, it returns CompactSentence which shares interned strings and MorphTags
+        Default is False
+    vocabulary : Vocabulary or None
+        If not None, it returns CompactSentence interned to the vocabulary
 
     Returns
     -------
-    sents : list of Sentence
+    sents : list of Sentence or list of CompactSentence
+    """
+    sents = iter_a_sentences_file(path, num_sents)
+    if compact or vocabulary is not None:
+        from .compact import CompactSentence
+        sents = (CompactSentence.from_sentence(sent, vocabulary) for sent in sents)
+    return list(sents)
+
+def iter_a_sentences_file(path, num_sents=-1):
+    """
+    Arguments
+    ---------
+    path : str
+        Sentences format file path
+    num_sents : int
+        Maximum number of sentences
+        If the value is negative, it yields all sentences
+
+    Yields
+    ------
+    sent : Sentence
+        It reads the file line by line, and stops reading when num_sents sentences are yielded
+
+    Usage
+    -----
+        >>> for sent in iter_a_sentences_file('sejong_corpus.txt'):
+        >>>     # do something
     """
-    sents = []
+    n_sents = 0
     with open(path, encoding='utf-8') as f:
         eojeols = []
         list_of_morphtags = []
         for line in f:
-            if num_sents > 0 and len(sents) >= num_sents:
-                eojeols = []
-                break
             line = line.strip()
             if not line and eojeols:
-                sent = Sentence(eojeols, list_of_morphtags)
-                sents.append(sent)
+                yield Sentence(eojeols, list_of_morphtags)
+                n_sents += 1
+                if num_sents > 0 and n_sents >= num_sents:
+                    return
                 eojeols = []
                 list_of_morphtags = []
                 continue
             if not line:
                 continue
-            eojeol, morphtags = line.split('\t')
-            morphtags = [MorphTag(*mt.rsplit('/', 1)) for mt in morphtags.split(' + ')]
+            eojeol, morphtags = parse_eojeol_line(line)
             eojeols.append(eojeol)
             list_of_morphtags.append(morphtags)
     if eojeols:
-        sent = Sentence(eojeols, list_of_morphtags)
-        sents.append(sent)
-    return sents
+        yield Sentence(eojeols, list_of_morphtags)
 
-def load_a_sejong_file(path, remain_dummy_morpheme=False, debug=False, num_sents=-1):
+def parse_eojeol_line(line):
+    """
+    Argument
+    --------
+    line : str
+        A stripped line of Sentences format file, 'eojeol\tmorph/tag + morph/tag'
+
+    Returns
+    -------
+    eojeol : str
+    morphtags : list of MorphTag
+    """
+    eojeol, morphtags = line.split('\t')
+    morphtags = [MorphTag(*mt.rsplit('/', 1)) for mt in morphtags.split(' + ')]
+    return eojeol, morphtags
+
+def parse_a_sentences_block(text):
+    """
+    Argument
+    --------
+    text : str
+        A sentence in Sentences format file
+
+    Returns
+    -------
+    sent : Sentence
+    """
+    lines = [line.strip() for line in text.split('\n')]
+    eojeols, list_of_morphtags = zip(*[parse_eojeol_line(line) for line in lines if line])
+    return Sentence(list(eojeols), list(list_of_morphtags))
+
+def load_a_sejong_file(path, remain_dummy_morpheme=False, debug=False, num_sents=-1, parser='soup'):
     """
     Argument
     --------
@@ -311,6 +735,10 @@ def load_a_sejong_file(path, remain_dummy_morpheme=False, debug=False, num_sents
     num_sents : int
         Maximum number of sentences
         If the value is negative, it loads all sentences
+    parser : str
+        If 'soup', it parses the file as a BeautifulSoup document
+        If 'stream', it reads the file line by line with stream_sentence_blocks
+        Default is 'soup'
 
     Returns
     -------
@@ -345,44 +773,125 @@ def load_a_sejong_file(path, remain_dummy_morpheme=False, debug=False, num_sents
     -----
         $ path = '../data/raw/written/BTAA0001.txt'
         $ sentences, n_errors = load_a_sejong_file(path)
+        $ sentences, n_errors = load_a_sejong_file(path, parser='stream')
     """
-    soup = read_txt_as_soup(path)
-
-    if is_colloquial_file(path):
-        sentences = select_sentence_from_colloquial(soup)
-    else:
-        sentences = select_sentence_from_written(soup, path)
+    sentences, n_errors = [], 0
+    sents = iter_a_sejong_file(path, remain_dummy_morpheme, debug, parser)
+    for sent in sents:
+        if sent is None:
+            n_errors += 1
+            continue
+        sentences.append(sent)
+        if num_sents > 0 and len(sentences) >= num_sents:
+            # the remained part of the file is not read with 'stream' parser
+            sents.close()
+            break
+    if debug and n_errors > 0:
+        print('Found %d sentences having wrong eojeols or tags' % n_errors)
+    return sentences, n_errors
 
-    sentences = [unicode_sentence(sent) for sent in sentences]
-    sentences = [sent for sent in sentences if sent]
+def iter_a_sejong_file(path, remain_dummy_morpheme=False, debug=False, parser='soup'):
+    """
+    Arguments
+    ---------
+    path : str
+        File path
+    remain_dummy_morpheme : Boolean
+        Same with load_a_sejong_file
+    debug : Boolean
+        Same with load_a_sejong_file
+    parser : str
+        Same with load_a_sejong_file
+        With 'stream', the file is read only until the consumer stops the iteration
 
-    n_errors = len(sentences)
-    sentences = [sent for sent in sentences if base_checker(sent)]
-    sentences = [unify_morphemes_separator(sent) for sent in sentences]
+    Yields
+    ------
+    sent : Sentence or None
+        None means a failure for parsing text to Sentence.
+        Each sentence block is checked and converted to Sentence when it is requested
 
-    n_errors -= len(sentences)
-    if debug and n_errors > 0:
-        print("Found %d sentences having wrong or empty eojeols" % n_errors)
+    Usage
+    -----
+        $ for sent in iter_a_sejong_file(path, parser='stream'):
+        $     if sent is None:
+        $         continue
+    """
+    check_parser(parser)
+    if parser == 'stream':
+        sentences = stream_sentence_blocks(path)
+    else:
+        soup = read_txt_as_soup(path)
+        if is_colloquial_file(path):
+            sentences = select_sentence_from_colloquial(soup)
+        else:
+            sentences = select_sentence_from_written(soup, path)
 
-    sentences_ = []
-    for i, sent in enumerate(sentences):
-        if num_sents > 0 and len(sentences_) >= num_sents:
-            break
+    i = 0
+    for sent in sentences:
+        sent = unicode_sentence(sent)
+        if not sent:
+            continue
+        if not debug:
+            yield as_checked_sentence_instance(sent, remain_dummy_morpheme)
+            continue
+        if not base_checker(sent):
+            yield None
+            continue
+        sent = unify_morphemes_separator(sent)
         try:
-            sent = as_sentence_instance(sent, remain_dummy_morpheme)
-            if check_sejong_tagset(sent):
-                sentences_.append(sent)
-            else:
+            sent_ = as_sentence_instance(sent, remain_dummy_morpheme)
+            if not check_sejong_tagset(sent_):
                 if debug:
                     print('Found wrong sejong tag from {} th sent'.format(i))
-                n_errors += 1
-                continue
+                sent_ = None
         except Exception as e:
             if debug:
                 print('\n\nException message = {}'.format(e))
                 print('sentence text : {}'.format(sent))
-            n_errors += 1
-    return sentences_, n_errors
+            sent_ = None
+        i += 1
+        yield sent_
+
+def load_a_sejong_file_with_cache(path, cache, remain_dummy_morpheme=False, debug=False, parser='soup'):
+    """
+    Arguments
+    ---------
+    path : str
+        File path
+    cache : ParseCache
+        Parse cache. Only the parse of whole file is cached
+    remain_dummy_morpheme : Boolean
+        Same with load_a_sejong_file
+    debug : Boolean
+        Same with load_a_sejong_file
+    parser : str
+        Same with load_a_sejong_file
+
+    Returns
+    -------
+    sentences : list of Sentence
+        Same with load_a_sejong_file
+    n_errors : int
+        Same with load_a_sejong_file
+    cache_hit : Boolean
+        True if the sentences are loaded from cache
+
+    Usage
+    -----
+        $ cache = ParseCache()
+        $ sentences, n_errors, cache_hit = load_a_sejong_file_with_cache(path, cache)
+    """
+    key = cache.key(path, remain_dummy_morpheme, parser, parser_version)
+    cached = cache.load(key)
+    if cached is not None:
+        sents, n_errors = cached
+        sentences = [Sentence(eojeols, [[MorphTag(morph, tag) for morph, tag in mts] for mts in morphtags])
+                     for eojeols, morphtags in sents]
+        return sentences, n_errors, True
+
+    sentences, n_errors = load_a_sejong_file(path, remain_dummy_morpheme, debug, parser=parser)
+    cache.save(key, sentences, n_errors)
+    return sentences, n_errors, False
 
 def as_sentence_instance(sent, remain_dummy_morpheme):
     eojeol_morphtags = [e.split('\t') for e in sent.split('\n')]
@@ -399,6 +908,53 @@ def as_sentence_instance(sent, remain_dummy_morpheme):
     morphtags = [[MorphTag(m,t) for m,t in mts] for mts in morphtags]
     return Sentence(eojeols, morphtags)
 
+def as_checked_sentence_instance(sent, remain_dummy_morpheme=False):
+    """
+    Arguments
+    ---------
+    sent : str
+        Sentence block of which characters are fixed by unicode_sentence
+    remain_dummy_morpheme : Boolean
+        Same with load_a_sejong_file
+
+    Returns
+    -------
+    sentence : Sentence or None
+        It splits each eojeol line once, and does the works of base_checker,
+        unify_morphemes_separator, as_sentence_instance, Sentence preprocessing
+        and check_sejong_tagset in one pass.
+        It returns None when one of them rejects the sentence or raises an exception
+    """
+    eojeols, list_of_morphtags = [], []
+    for line in sent.split('\n'):
+        # base_checker
+        if ((not line) or (line.count('\t') != 1) or (not '/' in line) or ('->' in line)
+            or ('</SS' in line) or ('>/SS' in line)):
+            return None
+        # unify_morphemes_separator
+        if not (' + ' in line):
+            line = line.replace('+', ' + ').replace('+ /', '+/')
+        eojeol, mts = line.split('\t')
+        morphtags = []
+        for mt in mts.split(' + '):
+            mt = mt.rsplit('/', 1)
+            if (not remain_dummy_morpheme) and ('(' in mt[0]) and (')' in mt[0]):
+                continue
+            if len(mt) != 2 or not (mt[1] in sejong_tagset):
+                return None
+            morphtags.append(MorphTag(mt[0], mt[1]))
+        # Sentence preprocessing
+        if not eojeol and not morphtags:
+            continue
+        if not eojeol or not morphtags:
+            return None
+        eojeols.append(eojeol)
+        list_of_morphtags.append(morphtags)
+    # the items are already checked by remove_empty_items rules
+    sentence = Sentence.__new__(Sentence)
+    sentence.eojeols, sentence.morphtags = eojeols, list_of_morphtags
+    return sentence
+
 def is_colloquial_file(path):
     """
     Argument
@@ -455,6 +1011,138 @@ def select_sentence_from_written(soup, path):
     sentences = [remove_header(sent).strip() for sent in sentences]
     return sentences
 
+markup_pattern = re.compile('</?[a-zA-Z][^<>]*>')
+
+def markup_name(line):
+    """
+    Argument
+    --------
+    line : str
+        A line of raw Sejong corpus file
+
+    Returns
+    -------
+    name : str or None
+        Lower-cased element name if the line is an opening tag such as '<p>' or '<s n="00001">'
+        '/' + name if the line is a closing tag such as '</p>'
+        None if the line is not a markup line
+
+    Usage
+    -----
+        >>> markup_name('5CT_0016-00000001\t<s n="00001">')
+        $ 's'
+
+        >>> markup_name('</p>\n')
+        $ '/p'
+    """
+    line = line.split('\t', 1)[-1].strip()
+    if not (line[:1] == '<' and line[-1:] == '>'):
+        return None
+    name = line[1:-1].split(None, 1)
+    return name[0].lower() if name else None
+
+def as_block_text(lines):
+    # same as soup.text: remove inner tags, unescape html entities and strip
+    text = '\n'.join(lines)
+    text = markup_pattern.sub('', text)
+    return html.unescape(text).strip()
+
+def stream_sentence_blocks(path, encoding='utf-16'):
+    """
+    Arguments
+    ---------
+    path : str
+        File path
+    encoding : str
+        File encoding. Default is 'utf-16'
+
+    Yields
+    ------
+    sentence : str
+        Sentence block formed '\n'.join('eojeol\tmorph/tag + morph/tag')
+        It yields same sentence blocks with
+        select_sentence_from_written or select_sentence_from_colloquial
+        without building a BeautifulSoup document.
+
+    Usage
+    -----
+        >>> for sent in stream_sentence_blocks('../data/raw/colloquial/5CT_0016.txt'):
+        >>>     print(sent)
+        $ 걔	걔/NP
+          두	두/MM
+          ...
+    """
+    try:
+        f = open(path, encoding=encoding)
+    except:
+        raise ValueError('Failed to read txt: {}'.format(path))
+
+    with f:
+        if is_colloquial_file(path):
+            for sent in stream_sentence_from_colloquial(f):
+                yield sent
+        else:
+            for sent in stream_sentence_from_written(f, path):
+                yield sent
+
+def stream_sentence_from_colloquial(lines):
+    # state : 0 = before <text>, 1 = in <text>, 2 = in <s>, 3 = after </text>
+    state = 0
+    block = []
+    for line in lines:
+        if state == 3:
+            break
+        name = markup_name(line)
+        if state == 0:
+            if name == 'text':
+                state = 1
+            continue
+        if name == '/text':
+            if state == 2:
+                yield as_block_text(block)
+            state = 3
+        elif name == 's':
+            if state == 2:
+                yield as_block_text(block)
+            block = []
+            state = 2
+        elif name == '/s':
+            if state == 2:
+                yield as_block_text(block)
+            state = 1
+        elif state == 2:
+            block.append(line.rstrip('\n').split('\t', 1)[-1])
+
+def stream_sentence_from_written(lines, path):
+    def remove_header(sent):
+        sent_ = [eojeol.split('\t', 1)[-1].strip() for eojeol in sent.split('\n') if eojeol.count('\t') == 2]
+        sent_ = [eojeol for eojeol in sent_ if eojeol]
+        return '\n'.join(sent_)
+
+    def as_sentence(block):
+        sent = as_block_text(block)
+        if sent[:len(filename)] != filename:
+            return None
+        return remove_header(sent).strip()
+
+    filename = path.split(sep)[-1][:-4]
+    block = None
+    for line in lines:
+        name = markup_name(line)
+        if name == 'p' or name == '/p':
+            # an opening <p> closes the previous unclosed paragraph
+            if block is not None:
+                sent = as_sentence(block)
+                if sent is not None:
+                    yield sent
+            block = [] if name == 'p' else None
+        elif block is not None:
+            block.append(line.rstrip('\n'))
+    if block is not None:
+        sent = as_sentence(block)
+        if sent is not None:
+            yield sent
+
 def base_checker(sent):
     for eojeol in sent.split('\n'):
         # check "따라서\t따라서/Advecb"
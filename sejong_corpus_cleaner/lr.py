@@ -1,14 +1,22 @@
+from collections import OrderedDict
 import re
 
-from ._lr_rules import _rules
 from .simple_tag import to_simple_tag
+from .simple_tag import default_tagmap
 from .loader import MorphTag
+from .lr_rules import as_lr_rules
 from .utils import is_jaum, is_moum, is_hangle, compose, decompose
+from .utils import remove_jamo
 from .utils import check_lr_transformation
 from .utils import check_lemmatization
 
 
-def to_lr(eojeol, morphtags, noun_xsv_as_verb=False, xsv_as_root=False, rules=None, debug=False):
+# version of the L-R transformation. Increase it when to_lr returns different results,
+# so the tables and the counters built with the previous code are invalidated
+lr_version = 1
+
+def to_lr(eojeol, morphtags, noun_xsv_as_verb=False, xsv_as_root=False, rules=None, debug=False,
+    cache=None, lr_table=None):
     """
     Arguments
     ---------
@@ -31,11 +39,20 @@ def to_lr(eojeol, morphtags, noun_xsv_as_verb=False, xsv_as_root=False, rules=No
 
             $ "시작/NNG + 하/XSV + 다/EP" -> "시작/Noun + 하다/Verb"
 
-    rules : dict
-        L, R tramsform rules
-        {eojeol: ((L morph, L tag), (R morph, R tag))}
+    rules : LRRules, dict or None
+        L, R tramsform rules. If None, it uses the rules of lr_rules.txt
+        dict is {eojeol: ((L morph, L tag), (R morph, R tag))}, and it is added to the default
+        rules as exact rules. Without cache, a dict is compiled for each call, so compile it once
+        with as_lr_rules for many eojeols. With cache, it is compiled once per dict
     debug : Boolean
         If True, it shows local variables.
+        The cache is not used in debug mode
+    cache : LRCache or None
+        If not None, the results and the exceptions are memoized to the cache
+    lr_table : LRTable or None
+        If not None, it looks up the table built by build_lr_table first,
+        and it transforms only the pairs not in the table.
+        The table is used only when rules is None and debug is False
 
     Returns
     -------
@@ -45,23 +62,47 @@ def to_lr(eojeol, morphtags, noun_xsv_as_verb=False, xsv_as_root=False, rules=No
         l is namedtuple of (morph, tag) in L-R format, MorphTag type
         r is namedtuple of (morph, tag) in L-R format, MorphTag type
         b is boundary index of morphtags
+        With cache, the same list is returned for the same input. Do not modify it
     """
 
+    if cache is not None and not debug:
+        return cache.to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, rules, lr_table)
+    if isinstance(rules, dict):
+        rules = as_lr_rules(rules)
+    if debug:
+        return _to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, rules, debug)
+    return _to_lr_with_table(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, rules, lr_table)
+
+def _to_lr_with_table(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, rules, lr_table):
+    if lr_table is not None and rules is None:
+        if lr_table.options != (noun_xsv_as_verb, xsv_as_root):
+            lr_table.check_options(noun_xsv_as_verb, xsv_as_root)
+        results = lr_table.get(eojeol, morphtags)
+        if results is not None:
+            return results
+    return _to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, rules)
+
+def _to_lr(eojeol, morphtags, noun_xsv_as_verb=False, xsv_as_root=False, rules=None, debug=False):
     eojeol_raw = eojeol
     morphtags_raw = [mt for mt in morphtags]
 
     eojeol, morphtags = preprocess0(eojeol, morphtags)
+    # Each transform is called only when the tag signature satisfies its precondition.
+    # The skipped transforms always return (None, None, -1)
+    signature = TagSignature(morphtags)
 
     # ('6.25', [('6', 'SN'), ('.', 'SF'), ('25', 'SN')], False, False),
     # ('6.25의', [('6', 'SN'), ('.', 'SF'), ('25', 'SN'), ('의', 'JKO')], False, False),
-    l, r, b = transform_symbol_noun(eojeol, morphtags, debug)
-    if l is not None and check_lemmatization(eojeol, l, r):
-        return [(eojeol, l, r, morphtags, b)]
+    if signature.rindex_simple_tag(number_or_symbol) >= 1:
+        l, r, b = transform_symbol_noun(eojeol, morphtags, debug, signature)
+        if l is not None and check_lemmatization(eojeol, l, r):
+            return [(eojeol, l, r, morphtags, b)]
 
     # ('IBM에서는', [('IBM', 'SL'), ('에서', 'JKB'), ('는', 'JX'), False, False])
-    l, r, b = transform_foreign_noun(eojeol, morphtags, debug)
-    if l is not None and check_lemmatization(eojeol, l, r):
-        return [(eojeol, l, r, morphtags, b)]
+    if signature.tags[0] == 'SH' or signature.tags[0] == 'SL':
+        l, r, b = transform_foreign_noun(eojeol, morphtags, debug, signature)
+        if l is not None and check_lemmatization(eojeol, l, r):
+            return [(eojeol, l, r, morphtags, b)]
 
     eojeol, morphtags = preprocess1(eojeol, morphtags)
     if (not eojeol) or (not morphtags):
@@ -71,12 +112,18 @@ def to_lr(eojeol, morphtags, noun_xsv_as_verb=False, xsv_as_root=False, rules=No
             raise ValueError(message)
         return [(eojeol, None, None, [], -1)]
 
-    l, r, b = transform_with_rules0(eojeol, morphtags, debug=False)
+    # exact and prefix rules are found in one walk
+    rules = as_lr_rules(rules)
+    matched = rules.match(eojeol)
+    l, r, b = transform_with_prefix_rules(eojeol, morphtags, rules, matched=matched)
     if l is not None and check_lemmatization(eojeol, l, r):
         return [(eojeol, l, r, morphtags, b)]
 
-    if (not noun_xsv_as_verb) and (xsv_as_root):
-        separated = split_by_xsv(eojeol, morphtags, debug)
+    signature = TagSignature(morphtags)
+    has_predicator_suffix = signature.has_tag(predicator_suffix_tags)
+
+    if (not noun_xsv_as_verb) and (xsv_as_root) and has_predicator_suffix:
+        separated = split_by_xsv(eojeol, morphtags, debug, signature)
         if len(separated) == 2:
             (eojeol_0, morphtags_0), (eojeol_1, morphtags_1) = separated
             eojeol_0, l_0, r_0, morphtags_0, b_0 = to_lr(eojeol_0, morphtags_0,
@@ -85,14 +132,14 @@ def to_lr(eojeol, morphtags, noun_xsv_as_verb=False, xsv_as_root=False, rules=No
                 noun_xsv_as_verb=False, xsv_as_root=False, rules=rules, debug=debug)[0]
             return [(eojeol_0, l_0, r_0, morphtags_0, b_0), (eojeol_1, l_1, r_1, morphtags_1, b_1)]
 
-    l, r, b = transform_with_rules(eojeol, morphtags, rules=None, debug=debug)
+    l, r, b = transform_with_rules(eojeol, morphtags, rules, debug, signature, matched)
     if l is not None and check_lemmatization(eojeol, l, r):
         return [(eojeol, l, r, morphtags, b)]
 
     # prepare materials
     morphs = [mt.morph for mt in morphtags]
-    tags = [mt.tag for  mt in morphtags]
-    simple_tags = [to_simple_tag(tag) for tag in tags]
+    tags = signature.tags
+    simple_tags = signature.simple_tags
 
     l, r, b = transform_short_morphtag(eojeol, morphs, tags, simple_tags, debug)
     if l is not None and check_lemmatization(eojeol, l, r):
@@ -101,44 +148,201 @@ def to_lr(eojeol, morphtags, noun_xsv_as_verb=False, xsv_as_root=False, rules=No
     # 전성 어미가 존재할 경우.
     # noun_xsv_as_verb = True 이면 "시작/NNG + 하/XSV + ㄴ다/EP" -> "시작하/Verb + ㄴ다/Eomi"
     # noun_xsv_as_verb = False 이면 "시작/Noun + 한다/Verb" 로 변형한다.
-    l, r, b = transform_when_noun_is_changed_to_predicator(
-        eojeol, morphs, tags, simple_tags, noun_xsv_as_verb, debug)
-    if l is not None and check_lemmatization(eojeol, l, r):
-        # ('될텐데', [('되', 'VV'), ('ㄹ', 'ETM'), ('터', 'NNB'), ('이', 'VCP'), ('ㄴ데', 'EC')], False, False)
-        if (xsv_as_root or noun_xsv_as_verb) and (l.tag == 'Noun') and (r.tag == 'Adjective' or r.tag == 'Verb'):
-            r = MorphTag(r.morph, 'Josa')
-        return [(eojeol, l, r, morphtags, b)]
-
-    l, r, b = transform_normal_case(eojeol, morphs, tags, simple_tags, debug)
-    if l is not None and check_lemmatization(eojeol, l, r):
-        return [(eojeol, l, r, morphtags, b)]
+    if has_predicator_suffix:
+        l, r, b = transform_when_noun_is_changed_to_predicator(
+            eojeol, morphs, tags, simple_tags, noun_xsv_as_verb, debug, signature)
+        if l is not None and check_lemmatization(eojeol, l, r):
+            # ('될텐데', [('되', 'VV'), ('ㄹ', 'ETM'), ('터', 'NNB'), ('이', 'VCP'), ('ㄴ데', 'EC')], False, False)
+            if (xsv_as_root or noun_xsv_as_verb) and (l.tag == 'Noun') and (r.tag == 'Adjective' or r.tag == 'Verb'):
+                r = MorphTag(r.morph, 'Josa')
+            return [(eojeol, l, r, morphtags, b)]
+
+    if signature.has_simple_tag(normal_case_tags):
+        l, r, b = transform_normal_case(eojeol, morphs, tags, simple_tags, debug, signature)
+        if l is not None and check_lemmatization(eojeol, l, r):
+            return [(eojeol, l, r, morphtags, b)]
 
     # ('왜냐,', [('왜', 'MAG'), ('냐', 'EF'), (',', 'SP')], False, False),
     # ('진짜야?', [('진짜', 'MAG'), ('야', 'EF'), ('?', 'SF')], False, False),
     # ('야라는', [('야','IC'), ('라는','ETM')], False, False),
     # ('야라니?', [('야','IC'), ('라니','EF'), ('?','SF')], False, False),
     # ('여보셔요!"', [('여보','IC'), ('시','EP'), ('어요','EF'), ('!','SF'), ('"','SS')], False, False),
-    l, r, b = transform_exceptional_case(eojeol, morphs, tags, simple_tags, debug)
-    if l is not None and check_lemmatization(eojeol, l, r):
-        return [(eojeol, l, r, morphtags, b)]
+    if signature.has_simple_tag(exceptional_case_tags):
+        l, r, b = transform_exceptional_case(eojeol, morphs, tags, simple_tags, debug, signature)
+        if l is not None and check_lemmatization(eojeol, l, r):
+            return [(eojeol, l, r, morphtags, b)]
 
-    l, r, b = transform_only_eomi_josa(eojeol, morphtags, tags, simple_tags, debug)
-    if l is not None and check_lemmatization(eojeol, l, r):
-        return [(eojeol, l, r, morphtags, b)]
+    if signature.only_simple_tags(eomi_or_josa):
+        l, r, b = transform_only_eomi_josa(eojeol, morphtags, tags, simple_tags, debug)
+        if l is not None and check_lemmatization(eojeol, l, r):
+            return [(eojeol, l, r, morphtags, b)]
 
     message = 'Exception: Eojeol = {}, morphtags = {}'.format(eojeol_raw, morphtags_raw)
     raise ValueError(message)
 
-def split_by_xsv(eojeol, morphtags, debug=False):
+class LRCache:
+    """
+    Bounded LRU memo of to_lr. The key is (eojeol, morphtags, noun_xsv_as_verb,
+    xsv_as_root, compiled rules). Exceptions are also memoized, so the known
+    exception cases raise the same exception without transformation.
+    A dict of rules is compiled once and the cache keeps the dict with the compiled rules,
+    so modifying the dict after the first call is not reflected. Use a new dict instead.
+
+    Arguments
+    ---------
+    max_size : int
+        Maximum number of memoized results. The least recently used one is evicted
+        Default is 100000
+
+    Attributes
+    ----------
+    n_hits : int
+        Number of cache hits
+    n_misses : int
+        Number of cache misses
+    n_evictions : int
+        Number of evicted results
+
+    Usage
+    -----
+        >>> cache = LRCache()
+        >>> to_lr('예외적인', morphtags, cache=cache)
+        >>> make_lr_corpus(sents, lr_cache=cache)
+        >>> cache.n_hits, cache.n_misses, cache.n_evictions
+    """
+    def __init__(self, max_size=100000):
+        if max_size <= 0:
+            raise ValueError('max_size must be positive but {}'.format(max_size))
+        self.max_size = max_size
+        self.items = OrderedDict()
+        self.n_hits = 0
+        self.n_misses = 0
+        self.n_evictions = 0
+        # {id(dict): (dict, LRRules)}. The dict is kept, so its id is not reused
+        self._compiled_rules = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def clear(self):
+        self.items.clear()
+
+    def to_lr(self, eojeol, morphtags, noun_xsv_as_verb=False, xsv_as_root=False, rules=None, lr_table=None):
+        # LRRules is hashed by identity, and the key keeps the rules alive
+        if isinstance(rules, dict):
+            rules = self._compile_rules(rules)
+        key = (eojeol, tuple(tuple(mt) for mt in morphtags), noun_xsv_as_verb, xsv_as_root, rules)
+        value = self.items.get(key)
+        if value is None:
+            self.n_misses += 1
+            try:
+                value = (_to_lr_with_table(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, rules, lr_table), None)
+            except Exception as e:
+                value = (None, (type(e), e.args))
+            self.items[key] = value
+            if len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+                self.n_evictions += 1
+        else:
+            self.n_hits += 1
+            self.items.move_to_end(key)
+        result, error = value
+        if error is not None:
+            error_type, args = error
+            raise error_type(*args)
+        return result
+
+    def _compile_rules(self, rules):
+        compiled = self._compiled_rules.get(id(rules))
+        if compiled is None:
+            compiled = (rules, as_lr_rules(rules))
+            self._compiled_rules[id(rules)] = compiled
+        return compiled[1]
+
+predicator_suffix_tags = ('XSV', 'XSA', 'VCP', 'VCN')
+normal_case_tags = ('Noun', 'Pronoun', 'Numeral', 'Verb', 'Adjective')
+exceptional_case_tags = ('Adverb', 'Unk', 'Exclamation', 'Number', 'Determiner')
+number_or_symbol = ('Number', 'Symbol')
+eomi_or_josa = {'Eomi', 'Josa'}
+
+
+class TagSignature:
+    """
+    Tags, simple tags and their last positions of a morphtags.
+    It is computed once for each to_lr call, and the transform functions
+    use it instead of converting tags and scanning them with rindex for each target.
+
+    Arguments
+    ---------
+    morphtags : list of MorphTag
+        list of namedtuple of (morpheme, tag)
+
+    Attributes
+    ----------
+    tags : list of str
+        Tag sequence
+    simple_tags : list of str
+        Simplified tag sequence
+    last_tag : dict of (str, int)
+        Last index of each tag
+    last_simple_tag : dict of (str, int)
+        Last index of each simplified tag
+
+    Usage
+    -----
+        >>> signature = TagSignature(morphtags)
+        >>> signature.rindex_tag('XSV') # same with rindex(tags, 'XSV')
+        >>> signature.rindex_simple_tag(('Number', 'Symbol'))
+    """
+    __slots__ = ('tags', 'simple_tags', 'last_tag', 'last_simple_tag')
+
+    def __init__(self, morphtags):
+        tags = [mt.tag for mt in morphtags]
+        simple_tags = [default_tagmap.get(tag, 'Unk') for tag in tags]
+        self.tags = tags
+        self.simple_tags = simple_tags
+        self.last_tag = {tag: i for i, tag in enumerate(tags)}
+        self.last_simple_tag = {tag: i for i, tag in enumerate(simple_tags)}
+
+    def rindex_tag(self, target):
+        return self.last_tag.get(target, -1)
+
+    def rindex_simple_tag(self, target):
+        """
+        Argument
+        --------
+        target : str or tuple of str
+            A target simple tag or simple tags
+
+        Returns
+        -------
+        index : int
+            Same with rindex(simple_tags, target). -1 if not exists
+        """
+        if isinstance(target, str):
+            return self.last_simple_tag.get(target, -1)
+        return max(self.last_simple_tag.get(t, -1) for t in target)
+
+    def has_tag(self, targets):
+        return any(t in self.last_tag for t in targets)
+
+    def has_simple_tag(self, targets):
+        return any(t in self.last_simple_tag for t in targets)
+
+    def only_simple_tags(self, targets):
+        return all(t in targets for t in self.last_simple_tag)
+
+def split_by_xsv(eojeol, morphtags, debug=False, signature=None):
     """XSV, XSA, VCP, VCN 과 같은 전성어미가 존재하는 경우"""
 
-    tags = [mt.tag for mt in morphtags]
-    simple_tags = [to_simple_tag(mt.tag) for mt in morphtags]
-    for target in 'XSV XSA VCP VCN'.split():
-        i = rindex(tags, target)
+    if signature is None:
+        signature = TagSignature(morphtags)
+    simple_tags = signature.simple_tags
+    for target in predicator_suffix_tags:
+        i = signature.rindex_tag(target)
         if not (i > 0 and (simple_tags[i-1] == 'Noun' or simple_tags[i-1] == 'Adverb')):
             continue
-        eojeol_0_len = len(''.join([c for mt in morphtags[:i] for c in mt.morph if (not is_jaum(c) and not is_moum(c))]))
+        eojeol_0_len = len(remove_jamo(''.join(mt.morph for mt in morphtags[:i])))
         eojeol_0 = eojeol[:eojeol_0_len]
         eojeol_1 = eojeol[len(eojeol_0):]
         morphtags_0 = morphtags[:i]
@@ -222,16 +426,18 @@ def preprocess1(eojeol, morphtags):
     eojeol = normalize(eojeol)
     return eojeol, morphtags_
 
-def transform_symbol_noun(eojeol, morphtags, debug=False):
+def transform_symbol_noun(eojeol, morphtags, debug=False, signature=None):
     def all_are_number_or_symbol(simple_tags, i):
         for t in simple_tags[:i+1]:
             if not (t == 'Number' or t == 'Symbol'):
                 return False
         return True
 
-    simple_tags = [to_simple_tag(mt.tag) for mt in morphtags]
+    if signature is None:
+        signature = TagSignature(morphtags)
+    simple_tags = signature.simple_tags
     morphs = [mt.morph for mt in morphtags]
-    i = rindex(simple_tags, {'Number', 'Symbol'})
+    i = signature.rindex_simple_tag(number_or_symbol)
     if i >= 1 and all_are_number_or_symbol(simple_tags, i) and simple_tags[i] == 'Number':
         if debug:
             print('called transform_symbol_noun')
@@ -242,8 +448,10 @@ def transform_symbol_noun(eojeol, morphtags, debug=False):
         return l, r, i
     return None, None, -1
 
-def transform_foreign_noun(eojeol, morphtags, debug=False):
-    simple_tags = [to_simple_tag(mt.tag) for mt in morphtags]
+def transform_foreign_noun(eojeol, morphtags, debug=False, signature=None):
+    if signature is None:
+        signature = TagSignature(morphtags)
+    simple_tags = signature.simple_tags
     if (morphtags[0].tag == 'SH') or (morphtags[0].tag == 'SL'):
         if debug:
             print('called transform_foreign_noun')
@@ -255,31 +463,35 @@ def transform_foreign_noun(eojeol, morphtags, debug=False):
             return MorphTag(morph_l, 'Noun'), MorphTag(morph_r, simple_tags[1]), 0
     return None, None, -1
 
-def transform_with_rules0(eojeol, morphtags, debug=False):
-    if eojeol[:2] == '어쨌':
-        return MorphTag('어찌하', 'Verb'), MorphTag('았'+eojeol[2:], 'Eomi'), -1
-    if eojeol[:2] == '어쩔':
-        return MorphTag('어찌하', 'Verb'), MorphTag('알'+eojeol[2:], 'Eomi'), -1
-    if eojeol[:2] == '제것':
-        return MorphTag('제것', 'Noun'), MorphTag(eojeol[2:], 'Josa'), -1
-    if eojeol[:3] == '이뤄졌':
-        return MorphTag('이뤄지', 'Verb'), MorphTag(eojeol[3:], 'Eomi'), -1
-    return None, None, -1
+def transform_with_prefix_rules(eojeol, morphtags, rules=None, debug=False, matched=None):
+    # ('어쨌든', ...) -> 어찌하/Verb + 았든/Eomi
+    if matched is None:
+        matched = as_lr_rules(rules).match(eojeol)
+    prefix = matched[1]
+    if prefix is None:
+        return None, None, -1
+    if debug:
+        print('called transform_with_prefix_rules')
+    length, (l, r) = prefix
+    return l, MorphTag(r.morph + eojeol[length:], r.tag), -1
 
-def transform_with_rules(eojeol, morphtags, rules=None, debug=False):
-    if to_simple_tag(morphtags[-1].tag) == 'Noun':
+def transform_with_rules(eojeol, morphtags, rules=None, debug=False, signature=None, matched=None):
+    if signature is None:
+        last_simple_tag = to_simple_tag(morphtags[-1].tag)
+    else:
+        last_simple_tag = signature.simple_tags[-1]
+    if last_simple_tag == 'Noun':
         if debug:
             print('called transform_with_rules')
         return MorphTag(eojeol, 'Noun'), None, len(morphtags)-1
-    if rules is None:
-        rules = _rules
-    (morph_l, tag_l), (morph_r, tag_r) = rules.get(eojeol, ((None, None), (None, None)))
-    if morph_l is None:
+    if matched is None:
+        matched = as_lr_rules(rules).match(eojeol)
+    exact = matched[0]
+    if exact is None:
         return None, None, -1
     if debug:
         print('called transform_with_rules')
-    l = MorphTag(morph_l, tag_l)
-    r = MorphTag(morph_r, tag_r) if morph_r is not None else None
+    l, r = exact
     return l, r, -1
 
 def transform_short_morphtag(eojeol, morphs, tags, simple_tags, debug=False):
@@ -317,11 +529,11 @@ def transform_short_morphtag(eojeol, morphs, tags, simple_tags, debug=False):
     return None, None, -1
 
 def transform_when_noun_is_changed_to_predicator(
-    eojeol, morphs, tags, simple_tags, noun_xsv_as_verb, debug=False):
+    eojeol, morphs, tags, simple_tags, noun_xsv_as_verb, debug=False, signature=None):
     """XSV, XSA, VCP, VCN 과 같은 전성어미가 존재하는 경우"""
 
-    for target in 'XSV XSA VCP VCN'.split():
-        i = rindex(tags, target)
+    for target in predicator_suffix_tags:
+        i = rindex(tags, target) if signature is None else signature.rindex_tag(target)
         if not ((i > 0) and (simple_tags[i-1] == 'Noun' or simple_tags[i-1] == 'Pronoun' or simple_tags[i-1] == 'Numeral' or simple_tags[i-1] == 'Adverb')):
             continue
         if debug:
@@ -333,9 +545,9 @@ def transform_when_noun_is_changed_to_predicator(
         return l, r, i
     return None, None, -1
 
-def transform_normal_case(eojeol, morphs, tags, simple_tags, debug=False):
-    for target in 'Noun Pronoun Numeral Verb Adjective'.split():
-        i = rindex(simple_tags, target)
+def transform_normal_case(eojeol, morphs, tags, simple_tags, debug=False, signature=None):
+    for target in normal_case_tags:
+        i = rindex(simple_tags, target) if signature is None else signature.rindex_simple_tag(target)
         if i >= 0:
             if debug:
                 print('called transform_normal_case')
@@ -343,9 +555,9 @@ def transform_normal_case(eojeol, morphs, tags, simple_tags, debug=False):
             return l, r, i
     return None, None, -1
 
-def transform_exceptional_case(eojeol, morphs, tags, simple_tags, debug=False):
-    for target in 'Adverb Unk Exclamation Number Determiner'.split():
-        i = rindex(simple_tags, target)
+def transform_exceptional_case(eojeol, morphs, tags, simple_tags, debug=False, signature=None):
+    for target in exceptional_case_tags:
+        i = rindex(simple_tags, target) if signature is None else signature.rindex_simple_tag(target)
         if i < 0:
             continue
         if debug:
@@ -410,7 +622,7 @@ def rindex(tags, target):
     return -1
 
 def lr_form(eojeol, morphs, tags, simple_tags, i, debug=False,
-    tag_l=None, tag_r=None, boundary_index_shift=0):
+    tag_l=None, tag_r=None, boundary_index_shift=0, return_boundary=False):
 
     """
     Arguments
@@ -433,93 +645,102 @@ def lr_form(eojeol, morphs, tags, simple_tags, i, debug=False,
     tag_r : str or None
         User specified tag
     boundary_index_shift : int
-        The movement from return of the surface_boundary function.
+        The initial movement from the surface boundary.
+    return_boundary : Boolean
+        If True, it also returns the selected surface boundary
 
     Returns
     -------
     l, r : tuple of MorphTag
         The length of tuple is 2. The value of r is null if R is empty
+    l, r, b : tuple
+        If return_boundary is True. b is the length of surface L, -1 if failed
+
+    It checks the boundary candidates from left to right in one loop, and returns
+    the first one accepted by check_lr_transformation. The candidates are shifted
+    only when L is compound predicator. Otherwise there is only one candidate.
     """
 
+    def as_return(l, r, b):
+        if return_boundary:
+            return l, r, b
+        return l, r
+
     n = len(morphs)
     if i == (n-1):
         if tag_l is None:
             tag_l = simple_tags[-1]
-        return (MorphTag(eojeol, tag_l), None)
+        return as_return(MorphTag(eojeol, tag_l), None, len(eojeol))
+
+    def is_compound_predicator():
+        for tag in simple_tags[:i]:
+            if tag == 'Verb' or tag == 'Adjective':
+                return True
+        return False
+
+    # ('세워져', [('세우', 'VV'), ('어', 'EC'), ('지', 'VX'), ('어', 'EC')], False, False),
+    is_compound = is_compound_predicator()
+    if is_compound:
+        b_begin = len(eojeol) - len(remove_jamo(''.join(morphs[i+1:])))
+    else:
+        b_begin = len(''.join(morphs[:i+1]))
+        # ('별로야.', [('별로', 'MAG'), ('이', 'VCP'), ('야', 'EF'), ('.', 'SF')], False, False),
+        if morphs[i] == '이' and tags[i] == 'VCP' and eojeol[b_begin-1] == morphs[i+1][0]:
+            b_begin -= 1
 
-    def only_hangle(morph):
-        return ''.join(c for c in morph if not (is_jaum(c) or is_moum(c)))
+    shift = boundary_index_shift
+    while True:
+        b = b_begin + shift if is_compound else b_begin
+        if b > len(eojeol):
+            return as_return(None, None, -1)
 
-    def surface_boundary():
-        def is_compound_predicator():
-            for tag in simple_tags[:i]:
-                if tag == 'Verb' or tag == 'Adjective':
-                    return True
-            return False
+        surface_l, surface_r = eojeol[:b], eojeol[b:]
 
-        morphs_l_concat = ''.join(morphs[:i+1])
-        morphs_r_concat = ''.join([only_hangle(m) for m in morphs[i+1:]])
+        if tag_l is None:
+            tag_l = simple_tags[i]
+        if tag_r is None:
+            tag_r = simple_tags[i+1] if i < (n-1) else None
+            if (tags[i+1] == 'VCP'):
+                # ('문화다.', [('문화', 'NNG'), ('이', 'VCP'), ('다', 'EF'), ('.', 'SF')], False, False),
+                if (surface_r and surface_r[0] == morphs[i+2][0]):
+                    tag_r = 'Josa'
+                # ('건지도', [('것', 'NNB'), ('이', 'VCP'), ('ㄴ지', 'EC'), ('도', 'JX')], False, False),
+                if (is_jaum(morphs[i+2][0])) and (len(morphs[i+2]) >= 2) and (surface_r[0] == morphs[i+2][1]):
+                    tag_r = 'Josa'
+
+        # ('이데올로기다.', [('이데올로기', 'NNG'), ('이', 'VCP'), ('다', 'EF')], False, False)
+        if (i > 0) and (tags[i] == 'VCP' and morphs[i] == '이') and (surface_l[-1] == morphs[i-1][-1]):
+            tag_l = 'Noun'
+            tag_r = 'Josa'
+            morph_l = surface_l
+        else:
+            morph_l = lemmatize_l(eojeol, surface_l, surface_r, morphs, tags, simple_tags, i, debug)
 
-        # ('세워져', [('세우', 'VV'), ('어', 'EC'), ('지', 'VX'), ('어', 'EC')], False, False),
-        if is_compound_predicator():
-            return len(eojeol) - len(morphs_r_concat) + boundary_index_shift
-        b = len(morphs_l_concat)
+        if tag_l in {'Verb', 'Adjective', 'Noun', 'Pronoun', 'Numeral'}:
+            morph_r = lemmatize_r(eojeol, surface_l, surface_r, morph_l, tag_l, tag_r, morphs, i, debug)
+        else:
+            morph_r = surface_r
 
-        # ('별로야.', [('별로', 'MAG'), ('이', 'VCP'), ('야', 'EF'), ('.', 'SF')], False, False),
-        if morphs[i] == '이' and tags[i] == 'VCP' and eojeol[b-1] == morphs[i+1][0]:
-            b -= 1
-        return b
-
-    b = surface_boundary()
-    if b > len(eojeol):
-        return None, None
-
-    surface_l, surface_r = eojeol[:b], eojeol[b:]
-
-    if tag_l is None:
-        tag_l = simple_tags[i]
-    if tag_r is None:
-        tag_r = simple_tags[i+1] if i < (n-1) else None
-        if (tags[i+1] == 'VCP'):
-            # ('문화다.', [('문화', 'NNG'), ('이', 'VCP'), ('다', 'EF'), ('.', 'SF')], False, False),
-            if (surface_r and surface_r[0] == morphs[i+2][0]):
-                tag_r = 'Josa'
-            # ('건지도', [('것', 'NNB'), ('이', 'VCP'), ('ㄴ지', 'EC'), ('도', 'JX')], False, False),
-            if (is_jaum(morphs[i+2][0])) and (len(morphs[i+2]) >= 2) and (surface_r[0] == morphs[i+2][1]):
-                tag_r = 'Josa'
-
-    # ('이데올로기다.', [('이데올로기', 'NNG'), ('이', 'VCP'), ('다', 'EF')], False, False)
-    if (i > 0) and (tags[i] == 'VCP' and morphs[i] == '이') and (surface_l[-1] == morphs[i-1][-1]):
-        tag_l = 'Noun'
-        tag_r = 'Josa'
-        morph_l = surface_l
-    else:
-        morph_l = lemmatize_l(eojeol, surface_l, surface_r, morphs, tags, simple_tags, i, debug)
+        right_form = check_lr_transformation(eojeol, (morph_l, tag_l), (morph_r, tag_r), debug)
 
-    if tag_l in {'Verb', 'Adjective', 'Noun', 'Pronoun', 'Numeral'}:
-        morph_r = lemmatize_r(eojeol, surface_l, surface_r, morph_l, tag_l, tag_r, morphs, i, debug)
-    else:
-        morph_r = surface_r
+        if debug:
+            print('Boundary  : {}'.format(b))
+            print('[surface / morph / tag]')
+            print('[{} / {} / {}]'.format(surface_l, morph_l, tag_l))
+            print('[{} / {} / {}]'.format(surface_r, morph_r, tag_r))
+            print('L-R checker : {}'.format(right_form))
 
-    right_form = check_lr_transformation(eojeol, (morph_l, tag_l), (morph_r, tag_r), debug)
+        if right_form:
+            if debug:
+                print('Selected boundary : {} (shift={})'.format(b, shift))
+            return as_return(MorphTag(morph_l, tag_l), MorphTag(morph_r, tag_r), b)
 
-    if debug:
-        print('Boundary  : {}'.format(b))
-        print('[surface / morph / tag]')
-        print('[{} / {} / {}]'.format(surface_l, morph_l, tag_l))
-        print('[{} / {} / {}]'.format(surface_r, morph_r, tag_r))
-        print('L-R checker : {}'.format(right_form))
-
-    if not right_form:
-        if (b + boundary_index_shift) >= len(eojeol):
-            return None, None
+        # The other candidates are same with this one if the boundary is not shifted
+        if (b + shift) >= len(eojeol) or not is_compound:
+            return as_return(None, None, -1)
         if debug:
             print('-- re-try with shifting boundary index +1 --')
-        l, r = lr_form(eojeol, morphs, tags, simple_tags, i, debug,
-            tag_l, tag_r, boundary_index_shift+1)
-        return l, r
-
-    return MorphTag(morph_l, tag_l), MorphTag(morph_r, tag_r)
+        shift += 1
 
 def lemmatize_l(eojeol, surface_l, surface_r, morphs, tags, simple_tags, i, debug=False):
     # use last character of morphs
@@ -0,0 +1,295 @@
+import os
+
+from .loader import MorphTag
+
+
+default_rules_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lr_rules.txt')
+
+# keys of the values stored in trie nodes. Characters of eojeol are str
+_EXACT = 0
+_PREFIX = 1
+_EOMI = 2
+
+
+class LRRules:
+    """
+    L-R transformation rules compiled into a character trie.
+    Exact rules and prefix rules of an eojeol are found in one walk,
+    so the matching cost depends on the length of eojeol, not the number of rules.
+
+        exact rule : eojeol -> (L, R)
+        prefix rule : prefix of eojeol -> (L, R). The rest of eojeol is appended to R morph
+        eomi rule : L-R format Eomi -> Sejong morphemes (make_lr_eomi_to_sejong_converter output)
+
+    If several prefix rules match an eojeol, the longest one is used.
+
+    Arguments
+    ---------
+    paths : str, list of str or None
+        Rule file paths. The file consists with tab separated lines
+
+            exact   그런지는    그렇/Adjective    ㄴ지는/Eomi
+            prefix  어쨌        어찌하/Verb       았/Eomi
+            었다/Eomi   었/EP + 다/EF   19
+
+        Empty R column means that R is None.
+        The last format is the output file of make_lr_eomi_to_sejong_converter.
+        Empty lines and lines begin with '#' are ignored
+
+    Usage
+    -----
+        >>> rules = LRRules(['../data/lr_rules.txt', '../data/lr_eomi_rules.txt'])
+        >>> rules.add_exact('뭘', ('뭐', 'Pronoun'), ('ㄹ', 'Josa'))
+        >>> rules.add_prefix('어쨌', ('어찌하', 'Verb'), ('았', 'Eomi'))
+        >>> rules.match('어쨌든')
+        $ (None, (2, (어찌하/Verb, 았/Eomi)))
+        >>> to_lr(eojeol, morphtags, rules=rules)
+    """
+    def __init__(self, paths=None):
+        self.root = {}
+        self.n_exact = 0
+        self.n_prefix = 0
+        self.n_eomi = 0
+        if isinstance(paths, str):
+            paths = [paths]
+        if paths is not None:
+            for path in paths:
+                self.load(path)
+
+    def __len__(self):
+        return self.n_exact + self.n_prefix + self.n_eomi
+
+    @classmethod
+    def from_dict(cls, rules):
+        """
+        Argument
+        --------
+        rules : dict
+            {eojeol: ((L morph, L tag), (R morph, R tag))}
+            R morph is None if R is None
+
+        Returns
+        -------
+        rules : LRRules
+            Exact rules
+        """
+        lr_rules = cls()
+        for eojeol, (l, r) in rules.items():
+            lr_rules.add_exact(eojeol, l, None if r[0] is None else r)
+        return lr_rules
+
+    def copy(self):
+        """
+        Returns
+        -------
+        rules : LRRules
+            Rules which do not share the trie with this rules
+        """
+        rules = LRRules()
+        rules.root = _copy_node(self.root)
+        rules.n_exact = self.n_exact
+        rules.n_prefix = self.n_prefix
+        rules.n_eomi = self.n_eomi
+        return rules
+
+    def with_exact(self, rules):
+        """
+        Argument
+        --------
+        rules : dict
+            {eojeol: ((L morph, L tag), (R morph, R tag))}
+            R morph is None if R is None
+
+        Returns
+        -------
+        rules : LRRules
+            Copy of this rules with the exact rules added.
+            The added rules replace the exact rules of the same eojeols
+
+        Usage
+        -----
+            >>> rules = as_lr_rules(None).with_exact({'뭘': (('뭐', 'Pronoun'), ('ㄹ', 'Josa'))})
+        """
+        lr_rules = self.copy()
+        for eojeol, (l, r) in rules.items():
+            lr_rules.add_exact(eojeol, l, None if r is None or r[0] is None else r)
+        return lr_rules
+
+    def load(self, path):
+        with open(path, encoding='utf-8') as f:
+            for i, line in enumerate(f):
+                line = line.rstrip('\n')
+                if not line.strip() or line[0] == '#':
+                    continue
+                cols = line.split('\t')
+                try:
+                    if cols[0] == 'exact' or cols[0] == 'prefix':
+                        kind, key, l, r = cols
+                        l = _parse_morphtag(l)
+                        r = _parse_morphtag(r) if r else None
+                        if kind == 'exact':
+                            self.add_exact(key, l, r)
+                        else:
+                            self.add_prefix(key, l, r)
+                    else:
+                        r, morphtags, count = cols
+                        morphtags = [_parse_morphtag(mt) for mt in morphtags.split(' + ')]
+                        self.add_eomi(_parse_morphtag(r), morphtags, int(count))
+                except ValueError:
+                    raise ValueError('Wrong rule format at line {} of {}: {}'.format(i + 1, path, line))
+
+    def _node(self, key):
+        node = self.root
+        for c in key:
+            child = node.get(c)
+            if child is None:
+                child = {}
+                node[c] = child
+            node = child
+        return node
+
+    def add_exact(self, eojeol, l, r=None):
+        """
+        Arguments
+        ---------
+        eojeol : str
+            Eojeol
+        l : MorphTag or tuple
+            (morph, tag) of L
+        r : MorphTag, tuple or None
+            (morph, tag) of R
+        """
+        if not eojeol:
+            raise ValueError('Rule eojeol must not be empty')
+        node = self._node(eojeol)
+        if not (_EXACT in node):
+            self.n_exact += 1
+        node[_EXACT] = (MorphTag(*l), None if r is None else MorphTag(*r))
+
+    def add_prefix(self, prefix, l, r):
+        """
+        Arguments
+        ---------
+        prefix : str
+            Prefix of eojeol
+        l : MorphTag or tuple
+            (morph, tag) of L
+        r : MorphTag or tuple
+            (morph, tag) of R. The rest of eojeol is appended to R morph
+        """
+        if not prefix:
+            raise ValueError('Rule prefix must not be empty')
+        if r is None:
+            raise ValueError('R of prefix rule must not be None')
+        node = self._node(prefix)
+        if not (_PREFIX in node):
+            self.n_prefix += 1
+        node[_PREFIX] = (MorphTag(*l), MorphTag(*r))
+
+    def add_eomi(self, r, morphtags, count=0):
+        """
+        Arguments
+        ---------
+        r : MorphTag or tuple
+            (morph, tag) of L-R format Eomi
+        morphtags : list of MorphTag
+            Sejong format morphemes
+        count : int
+            Frequency. The most frequent morphemes are kept for each R
+        """
+        r = MorphTag(*r)
+        node = self._node(r.morph)
+        eomis = node.get(_EOMI)
+        if eomis is None:
+            eomis = {}
+            node[_EOMI] = eomis
+        previous = eomis.get(r.tag)
+        if previous is None:
+            self.n_eomi += 1
+        if previous is None or previous[1] < count:
+            eomis[r.tag] = (tuple(MorphTag(*mt) for mt in morphtags), count)
+
+    def match(self, eojeol):
+        """
+        Argument
+        --------
+        eojeol : str
+            Eojeol
+
+        Returns
+        -------
+        exact : tuple of MorphTag or None
+            (L, R) of exact rule. R may be None
+        prefix : tuple or None
+            (prefix length, (L, R)) of the longest matched prefix rule
+        """
+        node = self.root
+        prefix = None
+        for i, c in enumerate(eojeol):
+            node = node.get(c)
+            if node is None:
+                return None, prefix
+            value = node.get(_PREFIX)
+            if value is not None:
+                prefix = (i + 1, value)
+        return node.get(_EXACT), prefix
+
+    def eomi_to_sejong(self, r):
+        """
+        Argument
+        --------
+        r : MorphTag or tuple
+            (morph, tag) of L-R format Eomi
+
+        Returns
+        -------
+        morphtags : tuple of MorphTag or None
+            The most frequent Sejong format morphemes
+        """
+        morph, tag = r
+        node = self.root
+        for c in morph:
+            node = node.get(c)
+            if node is None:
+                return None
+        value = node.get(_EOMI, {}).get(tag)
+        return None if value is None else value[0]
+
+def _copy_node(node):
+    copied = {}
+    for key, value in node.items():
+        if key == _EOMI:
+            value = dict(value)
+        elif isinstance(key, str):
+            value = _copy_node(value)
+        copied[key] = value
+    return copied
+
+def _parse_morphtag(strf):
+    morph, tag = strf.rsplit('/', 1)
+    return MorphTag(morph, tag)
+
+def as_lr_rules(rules):
+    """
+    Argument
+    --------
+    rules : LRRules, dict or None
+        If None, it returns default rules loaded from lr_rules.txt
+        dict is {eojeol: ((L morph, L tag), (R morph, R tag))}, and it is added to
+        a copy of the default rules as exact rules
+
+    Returns
+    -------
+    rules : LRRules
+        New rules for dict. Compile the dict once and reuse the return
+    """
+    global default_rules
+    if default_rules is None:
+        default_rules = LRRules(default_rules_path)
+    if rules is None:
+        return default_rules
+    if isinstance(rules, dict):
+        return default_rules.with_exact(rules)
+    return rules
+
+default_rules = None
@@ -0,0 +1,274 @@
+from array import array
+import builtins
+import json
+import mmap
+import os
+import zlib
+
+from .counter_cache import file_digest
+from .loader import MorphTag
+from .lr import lr_version
+from .lr import to_lr
+from .lr_rules import default_rules_path
+
+
+lr_table_version = 2
+# corpus type: (noun_xsv_as_verb, xsv_as_root)
+lr_table_types = {
+    'type1': (False, False),
+    'type2': (True, False),
+    'type3': (False, True)
+}
+# version, noun_xsv_as_verb, xsv_as_root, lr_version, rules digest, number of slots, number of entries
+header_size = 7
+
+
+class LRTable:
+    """
+    Memory-mapped read-only hash table of to_lr results built by build_lr_table.
+    A lookup costs one hash, a few probes and one json decoding.
+    The table is available only when lr_rules.txt and lr_version are same with
+    those of build_lr_table. Otherwise it raises ValueError, and the table must be rebuilt.
+
+    Arguments
+    ---------
+    path : str
+        Table file path
+
+    Attributes
+    ----------
+    noun_xsv_as_verb : Boolean
+        to_lr option of the table
+    xsv_as_root : Boolean
+        to_lr option of the table
+    options : tuple of Boolean
+        (noun_xsv_as_verb, xsv_as_root)
+
+    Usage
+    -----
+        >>> table = LRTable('../data/clean/lr_table_type1.bin')
+        >>> to_lr(eojeol, morphtags, lr_table=table)
+        >>> make_lr_corpus(sents, lr_table=table)
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = memoryview(self._mmap)[:8 * header_size].cast('Q')
+        version = header[0]
+        if version != lr_table_version:
+            header.release()
+            self._mmap.close()
+            raise ValueError('Not supported L-R table version {}'.format(version))
+        _, noun_xsv_as_verb, xsv_as_root, version, digest, n_slots, n_entries = header.tolist()
+        header.release()
+        if (version, digest) != (lr_version, rules_digest()):
+            self._mmap.close()
+            raise ValueError('L-R table {} is built with different lr_rules.txt or L-R transformation. '
+                'Rebuild it with build_lr_table'.format(path))
+        self.noun_xsv_as_verb = bool(noun_xsv_as_verb)
+        self.xsv_as_root = bool(xsv_as_root)
+        self.options = (self.noun_xsv_as_verb, self.xsv_as_root)
+        self.n_slots = n_slots
+        self.n_entries = n_entries
+        begin = 8 * header_size
+        self._offsets = memoryview(self._mmap)[begin: begin + 8 * n_slots].cast('Q')
+        begin += 8 * n_slots
+        self._hashes = memoryview(self._mmap)[begin: begin + 4 * n_slots].cast('I')
+
+    def close(self):
+        self._offsets.release()
+        self._hashes.release()
+        self._mmap.close()
+
+    def __len__(self):
+        return self.n_entries
+
+    def check_options(self, noun_xsv_as_verb, xsv_as_root):
+        if self.options != (bool(noun_xsv_as_verb), bool(xsv_as_root)):
+            raise ValueError('L-R table is built with noun_xsv_as_verb={}, xsv_as_root={}'.format(
+                self.noun_xsv_as_verb, self.xsv_as_root))
+
+    def get(self, eojeol, morphtags):
+        """
+        Arguments
+        ---------
+        eojeol : str
+            Eojeol text
+        morphtags : list of MorphTag
+            list of namedtuple of (morpheme, tag)
+
+        Returns
+        -------
+        list_eojeol_morphtags : list of tuple or None
+            Same with the return of to_lr. None if the pair is not in the table.
+            It raises the exception memoized in the table.
+        """
+        key = encode_key(eojeol, morphtags)
+        h = zlib.crc32(key)
+        i = h % self.n_slots
+        buffer = self._mmap
+        while True:
+            offset = self._offsets[i]
+            if offset == 0:
+                return None
+            if self._hashes[i] == h:
+                key_len, value_len = array('I', buffer[offset: offset + 8])
+                begin = offset + 8
+                if buffer[begin: begin + key_len] == key:
+                    begin += key_len
+                    return decode_value(buffer[begin: begin + value_len])
+            i = (i + 1) % self.n_slots
+
+def rules_digest():
+    """
+    Returns
+    -------
+    digest : int
+        The first 64 bits of sha1 hash of lr_rules.txt
+    """
+    return int(file_digest(default_rules_path)[:16], 16)
+
+def encode_key(eojeol, morphtags):
+    strf = '\x1e'.join([eojeol] + ['{}\x1f{}'.format(morph, tag) for morph, tag in morphtags])
+    return strf.encode('utf-8')
+
+def encode_value(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root):
+    try:
+        results = to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root)
+    except Exception as e:
+        value = {'error': [type(e).__name__, list(e.args)]}
+    else:
+        as_list = lambda mt: None if mt is None else list(mt)
+        value = {'results': [[e, as_list(l), as_list(r), [list(mt) for mt in mts], b]
+                             for e, l, r, mts, b in results]}
+    return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+def decode_value(value):
+    value = json.loads(value.decode('utf-8'))
+    if 'error' in value:
+        name, args = value['error']
+        error_type = getattr(builtins, name, None)
+        if not (isinstance(error_type, type) and issubclass(error_type, Exception)):
+            error_type = ValueError
+        raise error_type(*args)
+    as_morphtag = lambda mt: None if mt is None else MorphTag(*mt)
+    return [(e, as_morphtag(l), as_morphtag(r), [MorphTag(*mt) for mt in mts], b)
+            for e, l, r, mts, b in value['results']]
+
+def collect_eojeol_morphtags(sentences):
+    """
+    Argument
+    --------
+    sentences : list of Sentence or Sentences
+        Iterable object consists with Sentence instance
+
+    Returns
+    -------
+    pairs : list of tuple
+        Unique (eojeol, tuple of MorphTag) in the order of appearance
+    """
+    pairs = {}
+    for sent in sentences:
+        for eojeol, morphtags in sent:
+            pairs[(eojeol, tuple(morphtags))] = None
+    return list(pairs)
+
+def build_lr_table(pairs, path, noun_xsv_as_verb=False, xsv_as_root=False):
+    """
+    Arguments
+    ---------
+    pairs : list of tuple
+        Unique (eojeol, morphtags). The return of collect_eojeol_morphtags,
+        or the keys of make_counter(sents, convert_lr=False)
+    path : str
+        Table file path
+    noun_xsv_as_verb : Boolean
+        Same with to_lr
+    xsv_as_root : Boolean
+        Same with to_lr
+
+    It converts each pair once and writes an open addressing hash table.
+    The file consists with
+        header : [version, noun_xsv_as_verb, xsv_as_root, lr_version, rules digest, n_slots, n_entries]
+            as unsigned 64 bit integers
+        offsets : record offset of each slot as unsigned 64 bit integers. 0 is empty slot
+        hashes : crc32 of key of each slot as unsigned 32 bit integers
+        records : [key length, value length] as unsigned 32 bit integers, key bytes and value bytes
+    Integers follow the byte order of the machine.
+
+    Usage
+    -----
+        >>> pairs = collect_eojeol_morphtags(Sentences(paths))
+        >>> build_lr_table(pairs, '../data/clean/lr_table_type1.bin')
+    """
+    n_entries = len(pairs)
+    n_slots = 2 * n_entries + 1
+    offsets = array('Q', [0]) * n_slots
+    hashes = array('I', [0]) * n_slots
+    offset = 8 * header_size + 12 * n_slots
+
+    dirname = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dirname, exist_ok=True)
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'wb') as f:
+        f.seek(offset)
+        for eojeol, morphtags in pairs:
+            key = encode_key(eojeol, morphtags)
+            value = encode_value(eojeol, list(morphtags), noun_xsv_as_verb, xsv_as_root)
+            h = zlib.crc32(key)
+            i = h % n_slots
+            while offsets[i] != 0:
+                i = (i + 1) % n_slots
+            offsets[i] = offset
+            hashes[i] = h
+            f.write(array('I', [len(key), len(value)]).tobytes())
+            f.write(key)
+            f.write(value)
+            offset += 8 + len(key) + len(value)
+        f.seek(0)
+        header = [lr_table_version, int(noun_xsv_as_verb), int(xsv_as_root), lr_version, rules_digest(),
+            n_slots, n_entries]
+        f.write(array('Q', header).tobytes())
+        f.write(offsets.tobytes())
+        f.write(hashes.tobytes())
+    os.replace(tmp_path, path)
+
+def build_lr_tables(sentences, dirname, corpus_types=None):
+    """
+    Arguments
+    ---------
+    sentences : list of Sentence or Sentences
+        Iterable object consists with Sentence instance
+    dirname : str
+        Output directory
+    corpus_types : list of str or None
+        Subset of ['type1', 'type2', 'type3']. If None, it builds all types
+
+    Returns
+    -------
+    paths : dict of str
+        {corpus type: table file path}. The file name is lr_table_{corpus type}.bin
+
+    Usage
+    -----
+        >>> build_lr_tables(Sentences(paths), '../data/clean/')
+    """
+    if corpus_types is None:
+        corpus_types = sorted(lr_table_types)
+    for corpus_type in corpus_types:
+        if not (corpus_type in lr_table_types):
+            raise ValueError('corpus_type must be one of {} but {}'.format(sorted(lr_table_types), corpus_type))
+
+    pairs = collect_eojeol_morphtags(sentences)
+    paths = {}
+    for corpus_type in corpus_types:
+        noun_xsv_as_verb, xsv_as_root = lr_table_types[corpus_type]
+        path = lr_table_path(dirname, corpus_type)
+        build_lr_table(pairs, path, noun_xsv_as_verb, xsv_as_root)
+        paths[corpus_type] = path
+        print('Built {} L-R table of {} (eojeol, morphtags) pairs at {}'.format(corpus_type, len(pairs), path))
+    return paths
+
+def lr_table_path(dirname, corpus_type):
+    return '{}/lr_table_{}.bin'.format(dirname, corpus_type)
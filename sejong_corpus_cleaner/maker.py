@@ -1,9 +1,29 @@
 from collections import defaultdict
+from functools import partial
+from itertools import islice
+from multiprocessing import cpu_count
 import os
+import pickle
 import traceback
 
+from .compact import CompactSentence
+from .counter import CompactCounter
+from .counter_cache import CounterCache
+from .counter_cache import file_digest
+from .external import ExternalCounter
 from .loader import Sentence
+from .loader import Sentences
+from .loader import parser_version
+from .loader import parallel_load_files
+from .lr import LRCache
+from .lr import lr_version
+from .lr_rules import as_lr_rules
+from .lr_rules import default_rules_path
 from .lr import to_lr, preprocess0, preprocess1
+from .lr_table import LRTable
+from .lr_table import collect_eojeol_morphtags
+from .sketch import ApproximateCounter
+from .vocabulary import Vocabulary
 
 
 def make_lr_eomi_to_sejong_converter(sents, noun_xsv_as_verb, filepath=None):
@@ -84,7 +104,7 @@ def write_rules(rules, path):
             strf = ' + '.join(str(m) for m in morphtags)
             f.write('{}\t{}\t{}\n'.format(r, strf, count))
 
-def write_sentences(sentences, path):
+def write_sentences(sentences, path, vocabulary=None):
     """
     Arguments
     ---------
@@ -92,15 +112,20 @@ def write_sentences(sentences, path):
         Iterable object consists with Sentence instance
     path : str
         File path
+    vocabulary : Vocabulary or None
+        If not None, eojeols and morphemes of the written sentences are interned to the vocabulary
     """
     i = 0
     with open(path, 'w', encoding='utf-8') as f:
         for i, sent in enumerate(sentences):
+            if vocabulary is not None:
+                vocabulary.encode_sentence(sent)
             f.write('{}\n'.format(str(sent)))
     print('{} sentences has been written at {}'.format(i+1, path))
 
 def make_counter(sentences, eojeol_morpheme_pair=True, convert_lr=False,
-    noun_xsv_as_verb=False, xsv_as_root=False, show_exception_cases=False):
+    noun_xsv_as_verb=False, xsv_as_root=False, show_exception_cases=False, vocabulary=None,
+    n_jobs=1, chunk_size=1000, compact=False, approximate=None, external=None, verbose=True, rules=None):
     """
     Arguments
     ---------
@@ -137,57 +162,309 @@ def make_counter(sentences, eojeol_morpheme_pair=True, convert_lr=False,
 
     show_exception_cases : Boolean
         If True, it shows exception cases for debugging.
+    vocabulary : Vocabulary or None
+        If not None, (eojeol, morphtags) pairs are counted with CompactCounter
+        as packed integer id sequences, and the ids are decoded once for each distinct pair.
+        The returned counter is same regardless of vocabulary
+    n_jobs : int
+        Number of worker processes. If the value is negative, it uses all cores
+        Workers count partitions of chunk_size sentences, and the partial counters
+        are merged in the order of partitions. Then the distinct pairs are converted
+        to L-R format in parallel if convert_lr is True.
+        The returned counter, including the order of keys, is same with n_jobs=1
+        Default is 1
+    chunk_size : int
+        Number of sentences (or distinct pairs when converting) sent to a worker process at once
+        Default is 1000
+    compact : Boolean
+        If True, it returns CompactCounter instead of dict.
+        If vocabulary is None, the counter creates new Vocabulary
+        Default is False
+    approximate : ApproximateCounter, int or None
+        If not None, it counts with fixed memory and returns the ApproximateCounter.
+        int is top_k of ApproximateCounter with the default error bounds.
+        The pairs are converted to L-R format while streaming, so the distinct pairs are not kept.
+        It is not available with vocabulary, compact and external
+        Default is None
+    external : ExternalCounter, int or None
+        If not None, it counts with at most max_keys distinct keys in memory
+        and returns the ExternalCounter. int is max_keys of ExternalCounter.
+        The partial counts are flushed to run files, and ExternalCounter.most_common
+        merges them into the same frequency-sorted table with exact counting.
+        Keys are converted to L-R format while streaming as same as approximate.
+        The counter owns a temporary directory of run files, so close it, or use it with
+        `with` statement, after writing the counter.
+        It is not available with vocabulary, compact and approximate
+        Default is None
+    verbose : Boolean
+        If True, it shows the summary of counting
+        Default is True
+    rules : LRRules, dict or None
+        Same with to_lr. It is compiled once before converting
+        Default is None
 
     Returns
     -------
-    counter : {key:frequency}
+    counter : {key:frequency}, CompactCounter, ApproximateCounter or ExternalCounter
+
+    If eojeol_morpheme_pair and convert_lr are False, the morphemes are counted directly
+    without counting (eojeol, morphtags) pairs first.
     """
 
-    counter = defaultdict(int)
-    for sent in sentences:
-        for eojeol, morphtags in sent:
-            key = (eojeol, tuple(morphtags))
-            counter[key] += 1
-    print('Found {} (eojeol, morphtags) pairs from Sejong corpus'.format(len(counter)))
+    n_jobs = cpu_count() if n_jobs < 0 else max(1, n_jobs)
+    if approximate is not None and external is not None:
+        raise ValueError('approximate and external are not available together')
+    if (approximate is not None or external is not None) and (compact or vocabulary is not None):
+        raise ValueError('compact and vocabulary are not available with approximate and external')
+    if compact and vocabulary is None:
+        vocabulary = Vocabulary()
+    if rules is not None:
+        rules = as_lr_rules(rules)
+
+    if approximate is not None:
+        if not isinstance(approximate, ApproximateCounter):
+            approximate = ApproximateCounter(top_k=approximate)
+        counter = count_stream(sentences, approximate, eojeol_morpheme_pair, convert_lr,
+            noun_xsv_as_verb, xsv_as_root, show_exception_cases, n_jobs, chunk_size, verbose, rules)
+        args = (len(counter), 'pairs' if eojeol_morpheme_pair else 'morphemes', counter.n_total,
+            '%.3f' % counter.error_bound, 1 - counter.sketch.delta)
+        if verbose:
+            print('Found top {} {} of {} from Sejong corpus. Error is at most {} with probability {}'.format(*args))
+        return counter
+
+    if external is not None:
+        if not isinstance(external, ExternalCounter):
+            external = ExternalCounter(max_keys=external)
+        counter = count_stream(sentences, external, eojeol_morpheme_pair, convert_lr,
+            noun_xsv_as_verb, xsv_as_root, show_exception_cases, n_jobs, chunk_size, verbose, rules)
+        counter.flush()
+        args = (counter.n_total, 'eojeols' if eojeol_morpheme_pair else 'morphemes', counter.n_runs)
+        if verbose:
+            print('Counted {} {} from Sejong corpus into {} run files'.format(*args))
+        return counter
+
+    def as_return(counter):
+        if compact:
+            return counter
+        if isinstance(counter, CompactCounter):
+            return counter.to_dict()
+        return dict(counter)
+
+    if (not eojeol_morpheme_pair) and (not convert_lr):
+        counter = count_morphemes(sentences, vocabulary, n_jobs, chunk_size)
+        if verbose:
+            print('Found {} morphemes from Sejong corpus'.format(len(counter)))
+        return as_return(counter)
+
+    counter = count_pairs(sentences, vocabulary, n_jobs, chunk_size)
+    if verbose:
+        print('Found {} (eojeol, morphtags) pairs from Sejong corpus'.format(len(counter)))
 
     if convert_lr:
         num_exceptions = 0
         count_exceptions = 0
-        counter_ = defaultdict(int)
-        for (eojeol, morphtags), count in counter.items():
-            try:
-                results = to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, debug=False)
-                for eojeol_, l, r, _, _ in results:
-                    if (not eojeol_) or (l is None):
-                        continue
-                    if r is None:
-                        key = (eojeol_, (l,))
-                    else:
-                        key = (eojeol_, (l, r))
-                    counter_[key] += count
-            except Exception as e:
+        counter_ = CompactCounter(vocabulary) if compact else defaultdict(int)
+        if n_jobs == 1:
+            converted = (pair_to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, rules=rules)
+                         for eojeol, morphtags in counter)
+        else:
+            converted = parallel_pairs_to_lr(list(counter), noun_xsv_as_verb, xsv_as_root, None, n_jobs, chunk_size, rules)
+        for ((eojeol, morphtags), count), results in zip(counter.items(), converted):
+            if results is None:
                 num_exceptions += 1
                 count_exceptions += count
                 if show_exception_cases:
-                    print('L-R format converting error in (eojeol={}, morphtags={})'.format(eojeol, morphtags))
-                    print(e, end='\n\n')
+                    try:
+                        to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, rules=rules, debug=False)
+                    except Exception as e:
+                        print('L-R format converting error in (eojeol={}, morphtags={})'.format(eojeol, morphtags))
+                        print(e, end='\n\n')
                 continue
+            for eojeol_, l, r in results:
+                if (not eojeol_) or (l is None):
+                    continue
+                if r is None:
+                    key = (eojeol_, (l,))
+                else:
+                    key = (eojeol_, (l, r))
+                counter_[key] += count
         counter = counter_
 
         count_total = sum(counter.values())
-        args = (len(counter_), num_exceptions, '%.3f' % (100 * count_exceptions / count_total) )
-        print('Found {} (eojeol, morphtags) pairs with {} ({} %) L-R transformation exception cases'.format(*args))
+        args = (len(counter_), num_exceptions, '%.3f' % (100 * count_exceptions / max(1, count_total)) )
+        if verbose:
+            print('Found {} (eojeol, morphtags) pairs with {} ({} %) L-R transformation exception cases'.format(*args))
 
     if not eojeol_morpheme_pair:
-        morph_counter = defaultdict(int)
+        morph_counter = CompactCounter(vocabulary, morphemes=True) if compact else defaultdict(int)
         for (eojeol, morphemes), count in counter.items():
             for morph in morphemes:
                 morph_counter[morph] += count
-        return dict(morph_counter)
+        return as_return(morph_counter)
+
+    return as_return(counter)
+
+def count_pairs(sentences, vocabulary=None, n_jobs=1, chunk_size=1000):
+    """
+    Arguments
+    ---------
+    sentences : list of Sentence or Sentences
+        Iterable object consists with Sentence instance
+    vocabulary : Vocabulary or None
+        If not None, it returns CompactCounter using the vocabulary
+    n_jobs, chunk_size :
+        Same with make_counter
+
+    Returns
+    -------
+    counter : defaultdict or CompactCounter
+        {(eojeol, tuple of MorphTag): frequency} in the order of the first appearance
+    """
+    if n_jobs > 1:
+        counter = parallel_count_pairs(sentences, n_jobs, chunk_size)
+        if vocabulary is None:
+            return counter
+        # the ids are assigned in the same order as counting in one process
+        compact_counter = CompactCounter(vocabulary)
+        for key, count in counter.items():
+            compact_counter[key] = count
+        return compact_counter
+
+    if vocabulary is not None:
+        counter = CompactCounter(vocabulary)
+        for sent in sentences:
+            counter.add_sentence(sent)
+        return counter
+
+    counter = defaultdict(int)
+    for sent in sentences:
+        for eojeol, morphtags in sent:
+            key = (eojeol, tuple(morphtags))
+            counter[key] += 1
+    return counter
+
+def count_morphemes(sentences, vocabulary=None, n_jobs=1, chunk_size=1000):
+    """
+    Arguments
+    ---------
+    sentences : list of Sentence or Sentences
+        Iterable object consists with Sentence instance
+    vocabulary : Vocabulary or None
+        If not None, it returns CompactCounter using the vocabulary
+    n_jobs, chunk_size :
+        Same with make_counter
+
+    Returns
+    -------
+    counter : defaultdict or CompactCounter
+        {MorphTag: frequency} in the order of the first appearance.
+        It does not count (eojeol, morphtags) pairs
+    """
+    if n_jobs > 1:
+        counter = parallel_count_morphemes(sentences, n_jobs, chunk_size)
+        if vocabulary is None:
+            return counter
+        compact_counter = CompactCounter(vocabulary, morphemes=True)
+        for key, count in counter.items():
+            compact_counter[key] = count
+        return compact_counter
+
+    if vocabulary is not None:
+        counter = CompactCounter(vocabulary, morphemes=True)
+        for sent in sentences:
+            counter.add_morphemes(sent)
+        return counter
+
+    counter = defaultdict(int)
+    for sent in sentences:
+        for _, morphtags in sent:
+            for morphtag in morphtags:
+                counter[morphtag] += 1
+    return counter
+
+def make_counter_incrementally(paths, cache=None, eojeol_morpheme_pair=True, convert_lr=False,
+    noun_xsv_as_verb=False, xsv_as_root=False, processed=False, parser='soup', n_jobs=1, parse_cache=None,
+    verbose=True):
+    """
+    Arguments
+    ---------
+    paths : list of str
+        Sejong corpus file paths
+    cache : CounterCache, str or None
+        Per-file counter cache. If str, it is used as the cache directory
+        If None, it uses '../data/cache/counter/'
+    eojeol_morpheme_pair, convert_lr, noun_xsv_as_verb, xsv_as_root :
+        Same with make_counter
+    processed, parser :
+        Same with Sentences
+    n_jobs : int
+        Number of worker processes counting the changed files. If the value is negative, it uses all cores
+        Default is 1
+    parse_cache : ParseCache, str or None
+        Same with the cache of Sentences. It is used when the changed raw files are parsed
+    verbose : Boolean
+        If True, it shows the summary of counting each changed file and of merging
+        Default is True
+
+    Returns
+    -------
+    counter : {key:frequency}
+        Same with make_counter(Sentences(paths), ...), including the order of keys
+
+    Only the files whose content, name or counting options are changed are counted, and their
+    counters are stored in the cache. Then the counters of all files are merged in the order of paths.
 
+    Usage
+    -----
+        >>> counter = make_counter_incrementally(paths, '../data/cache/counter/', convert_lr=True)
+    """
+    if cache is None or isinstance(cache, str):
+        cache = CounterCache(cache)
+    n_jobs = cpu_count() if n_jobs < 0 else max(1, n_jobs)
+
+    options = (eojeol_morpheme_pair, convert_lr, noun_xsv_as_verb, xsv_as_root, processed, parser, parser_version)
+    if convert_lr:
+        # the converted counters are invalidated when lr_rules.txt or the L-R transformation changes
+        options += (file_digest(default_rules_path), lr_version)
+    keys = [cache.key(path, *options) for path in paths]
+    count = partial(_count_a_file, eojeol_morpheme_pair=eojeol_morpheme_pair, convert_lr=convert_lr,
+        noun_xsv_as_verb=noun_xsv_as_verb, xsv_as_root=xsv_as_root, processed=processed,
+        parser=parser, parse_cache=parse_cache, verbose=verbose)
+
+    changed = [(path, key) for path, key in zip(paths, keys) if not cache.exists(key)]
+    if n_jobs == 1:
+        counted = (count(path) for path, _ in changed)
+    else:
+        counted = parallel_load_files([path for path, _ in changed], count, n_jobs)
+    n_counted = 0
+    for (path, key), items in zip(changed, counted):
+        cache.save(key, items)
+        n_counted += 1
+
+    counter = defaultdict(int)
+    for path, key in zip(paths, keys):
+        items = cache.load(key)
+        if items is None:
+            # broken cache file
+            items = count(path)
+            cache.save(key, items)
+            n_counted += 1
+        for key_, frequency in items:
+            counter[key_] += frequency
+
+    args = (n_counted, len(paths) - n_counted, len(counter), 'pairs' if eojeol_morpheme_pair else 'morphemes')
+    if verbose:
+        print('Counted {} changed files and loaded {} files from counter cache. Found {} {}'.format(*args))
     return dict(counter)
 
-def make_lr_corpus(sentences, noun_xsv_as_verb=False, xsv_as_root=False, filepath=None):
+def _count_a_file(path, eojeol_morpheme_pair, convert_lr, noun_xsv_as_verb, xsv_as_root,
+    processed, parser, parse_cache, verbose):
+    sents = Sentences(path, verbose=False, processed=processed, parser=parser, cache=parse_cache)
+    counter = make_counter(sents, eojeol_morpheme_pair, convert_lr, noun_xsv_as_verb, xsv_as_root, verbose=verbose)
+    return list(counter.items())
+
+def make_lr_corpus(sentences, noun_xsv_as_verb=False, xsv_as_root=False, filepath=None, vocabulary=None,
+    lr_cache=None, lr_table=None, n_jobs=1, chunk_size=1000, dedup=False, rules=None):
     """
     Arguments
     ---------
@@ -214,8 +491,59 @@ def make_lr_corpus(sentences, noun_xsv_as_verb=False, xsv_as_root=False, filepat
         Else
 
             $ "시작/NNG + 하/XSV + 다/EP" -> "시작/Noun + 하다/Verb"
+
+    filepath : str or None
+        If not None, it writes L-R format sentences to the file instead of returning them
+    vocabulary : Vocabulary or None
+        If not None, the returned sentences are CompactSentence interned to the vocabulary.
+        If filepath is not None, the written sentences are interned to the vocabulary
+    lr_cache : LRCache, int or None
+        If not None, to_lr results of repeated (eojeol, morphtags) are memoized.
+        If int, it is used as the maximum size of a new LRCache
+    lr_table : LRTable, str or None
+        If not None, to_lr results are looked up from the table built by build_lr_table first.
+        If str, it is used as the table file path
+    n_jobs : int
+        Number of worker processes transforming sentences
+        If the value is negative, it uses all cores
+        The sentences are written or returned in the input order regardless of n_jobs
+        Default is 1
+    chunk_size : int
+        Number of sentences sent to a worker process at once
+        Default is 1000
+    dedup : Boolean
+        If True, it collects unique (eojeol, morphtags) pairs first, transforms each pair once
+        (in parallel if n_jobs > 1), and then rewrites the sentences by lookup.
+        A sentence which has a failed pair is counted as an exception as same as the default mode.
+        sentences is iterated twice, so an iterator is loaded into memory first.
+        lr_cache is not used, because each pair is transformed only once.
+        Default is False
+    rules : LRRules, dict or None
+        Same with to_lr. It is compiled once before transforming.
+        lr_table is not used with rules, because the table is built with the default rules
+        Default is None
     """
 
+    if isinstance(lr_cache, int):
+        lr_cache = LRCache(lr_cache)
+    if isinstance(lr_table, str):
+        lr_table = LRTable(lr_table)
+    if lr_table is not None:
+        lr_table.check_options(noun_xsv_as_verb, xsv_as_root)
+    if rules is not None:
+        rules = as_lr_rules(rules)
+    n_jobs = cpu_count() if n_jobs < 0 else max(1, n_jobs)
+
+    if dedup:
+        results = dedup_sentences_to_lr(sentences, noun_xsv_as_verb, xsv_as_root,
+            lr_table, n_jobs, chunk_size, rules)
+    elif n_jobs == 1:
+        results = (sentence_to_lr(sent, noun_xsv_as_verb, xsv_as_root, lr_cache, lr_table, rules)
+                   for sent in sentences)
+    else:
+        results = parallel_sentences_to_lr(sentences, noun_xsv_as_verb, xsv_as_root,
+            lr_cache, lr_table, n_jobs, chunk_size, rules)
+
     f = None
     if filepath is not None:
         f = open(filepath, 'w', encoding='utf-8')
@@ -224,20 +552,17 @@ def make_lr_corpus(sentences, noun_xsv_as_verb=False, xsv_as_root=False, filepat
     sents_lr = []
     num_sents = 0
 
-    for sent in sentences:
+    for result in results:
         num_sents += 1
+        if result is None:
+            num_exceptions += 1
+            continue
         try:
-            eojeols_lr = []
-            morphtags_lr = []
-            for eojeol, morphtags in sent:
-                for e, l, r, _, _ in to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root):
-                    eojeols_lr.append(e)
-                    if r is None:
-                        morphtags_lr.append([l])
-                    else:
-                        morphtags_lr.append([l, r])
-
-            sent_lr = Sentence(eojeols_lr, morphtags_lr)
+            eojeols_lr, morphtags_lr = result
+            if vocabulary is None:
+                sent_lr = Sentence(eojeols_lr, morphtags_lr)
+            else:
+                sent_lr = CompactSentence(eojeols_lr, morphtags_lr, vocabulary)
             if f is None:
                 sents_lr.append(sent_lr)
             else:
@@ -257,3 +582,357 @@ def make_lr_corpus(sentences, noun_xsv_as_verb=False, xsv_as_root=False, filepat
         return None
 
     return sents_lr
+
+def sentence_to_lr(sent, noun_xsv_as_verb=False, xsv_as_root=False, lr_cache=None, lr_table=None, rules=None):
+    """
+    Arguments
+    ---------
+    sent : Sentence
+        Or iterable of (eojeol, list of MorphTag)
+    noun_xsv_as_verb, xsv_as_root, lr_cache, lr_table, rules :
+        Same with make_lr_corpus
+
+    Returns
+    -------
+    (eojeols_lr, morphtags_lr) or None
+        None if to_lr fails to transform an eojeol in the sentence
+    """
+    try:
+        eojeols_lr = []
+        morphtags_lr = []
+        for eojeol, morphtags in sent:
+            for e, l, r, _, _ in to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root,
+                rules=rules, cache=lr_cache, lr_table=lr_table):
+                eojeols_lr.append(e)
+                if r is None:
+                    morphtags_lr.append([l])
+                else:
+                    morphtags_lr.append([l, r])
+    except Exception:
+        return None
+    return eojeols_lr, morphtags_lr
+
+# LRCache, LRTable and LRRules of each worker process
+_worker_lr_caches = {}
+_worker_lr_tables = {}
+_worker_lr_rules = {}
+
+def _dump_rules(rules):
+    # LRRules is sent to worker processes as pickled bytes
+    return None if rules is None else pickle.dumps(rules, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _load_rules(rules_data):
+    # the same bytes are unpickled once, so LRCache of the worker keys on the same LRRules
+    if rules_data is None:
+        return None
+    if not (rules_data in _worker_lr_rules):
+        _worker_lr_rules[rules_data] = pickle.loads(rules_data)
+    return _worker_lr_rules[rules_data]
+
+def _load_lr_cache(lr_cache_size):
+    if lr_cache_size is None:
+        return None
+    if not (lr_cache_size in _worker_lr_caches):
+        _worker_lr_caches[lr_cache_size] = LRCache(lr_cache_size)
+    return _worker_lr_caches[lr_cache_size]
+
+def _chunk_to_lr(chunk, noun_xsv_as_verb, xsv_as_root, lr_cache_size, lr_table_path, rules_data=None):
+    lr_cache, lr_table = _load_lr_cache(lr_cache_size), None
+    if lr_table_path is not None:
+        if not (lr_table_path in _worker_lr_tables):
+            _worker_lr_tables[lr_table_path] = LRTable(lr_table_path)
+        lr_table = _worker_lr_tables[lr_table_path]
+    rules = _load_rules(rules_data)
+    return [sentence_to_lr(sent, noun_xsv_as_verb, xsv_as_root, lr_cache, lr_table, rules) for sent in chunk]
+
+def parallel_sentences_to_lr(sentences, noun_xsv_as_verb, xsv_as_root, lr_cache, lr_table, n_jobs, chunk_size,
+    rules=None):
+    """
+    Arguments
+    ---------
+    sentences : list of Sentence or Sentences
+        Iterable object consists with Sentence instance
+    noun_xsv_as_verb, xsv_as_root : Boolean
+        Same with make_lr_corpus
+    lr_cache : LRCache or None
+        Each worker process uses its own LRCache of the same max_size
+    lr_table : LRTable or None
+        Each worker process opens the table file
+    n_jobs : int
+        Number of worker processes
+    chunk_size : int
+        Number of sentences sent to a worker at once
+    rules : LRRules or None
+        Compiled rules. Each worker process unpickles the rules once
+
+    Yields
+    ------
+    (eojeols_lr, morphtags_lr) or None
+        Same with sentence_to_lr, in the order of sentences
+    """
+    def chunks():
+        sents = iter(sentences)
+        while True:
+            # only (eojeol, morphtags) are sent, not the vocabulary of CompactSentence
+            chunk = [list(sent) for sent in islice(sents, chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+
+    transform = partial(_chunk_to_lr, noun_xsv_as_verb=noun_xsv_as_verb, xsv_as_root=xsv_as_root,
+        lr_cache_size=None if lr_cache is None else lr_cache.max_size,
+        lr_table_path=None if lr_table is None else lr_table.path, rules_data=_dump_rules(rules))
+    for results in parallel_load_files(chunks(), transform, n_jobs):
+        for result in results:
+            yield result
+
+def count_stream(sentences, counter, eojeol_morpheme_pair=True, convert_lr=False,
+    noun_xsv_as_verb=False, xsv_as_root=False, show_exception_cases=False, n_jobs=1, chunk_size=1000,
+    verbose=True, rules=None):
+    """
+    Arguments
+    ---------
+    sentences : list of Sentence or Sentences
+        Iterable object consists with Sentence instance
+    counter : ApproximateCounter or ExternalCounter
+        Counter which has add(key, count) method
+    eojeol_morpheme_pair, convert_lr, noun_xsv_as_verb, xsv_as_root, show_exception_cases, n_jobs, chunk_size, verbose, rules :
+        Same with make_counter
+
+    Returns
+    -------
+    counter : ApproximateCounter or ExternalCounter
+        The keys are same with make_counter, and they are added in the order of the first appearance.
+        Each (eojeol, morphtags) pair is converted to L-R format when it appears,
+        so the distinct pairs are not kept. The repeated pairs are converted once with LRCache.
+        If n_jobs > 1, each worker process counts and converts the pairs of its chunks
+
+    Usage
+    -----
+        >>> counter = count_stream(sents, ApproximateCounter(top_k=10000), convert_lr=True)
+        >>> counter.most_common(10)
+    """
+    if convert_lr and n_jobs > 1:
+        transform = partial(_count_lr_chunk, eojeol_morpheme_pair=eojeol_morpheme_pair,
+            noun_xsv_as_verb=noun_xsv_as_verb, xsv_as_root=xsv_as_root,
+            lr_cache_size=LRCache().max_size, rules_data=_dump_rules(rules))
+        converted = (item for items in parallel_load_files(
+            sentence_chunks(sentences, chunk_size), transform, n_jobs) for item in items)
+    elif convert_lr:
+        lr_cache = LRCache()
+        converted = ((pair, count, _pair_to_lr_keys(pair, eojeol_morpheme_pair, noun_xsv_as_verb, xsv_as_root,
+            lr_cache, rules)) for pair, count in (((eojeol, tuple(morphtags)), 1)
+            for sent in sentences for eojeol, morphtags in sent))
+    elif n_jobs > 1:
+        count_chunk = _count_pairs_chunk if eojeol_morpheme_pair else _count_morphemes_chunk
+        updates = (item for partial_counter in parallel_load_files(
+            sentence_chunks(sentences, chunk_size), count_chunk, n_jobs) for item in partial_counter.items())
+    elif eojeol_morpheme_pair:
+        updates = (((eojeol, tuple(morphtags)), 1) for sent in sentences for eojeol, morphtags in sent)
+    else:
+        updates = ((morphtag, 1) for sent in sentences for _, morphtags in sent for morphtag in morphtags)
+
+    if not convert_lr:
+        for key, count in updates:
+            counter.add(key, count)
+    else:
+        count_eojeols = 0
+        count_exceptions = 0
+        for pair, count, keys in converted:
+            count_eojeols += count
+            if keys is None:
+                count_exceptions += count
+                if show_exception_cases:
+                    eojeol, morphtags = pair
+                    try:
+                        to_lr(eojeol, list(morphtags), noun_xsv_as_verb, xsv_as_root, rules=rules, debug=False)
+                    except Exception as e:
+                        print('L-R format converting error in (eojeol={}, morphtags={})'.format(eojeol, morphtags))
+                        print(e, end='\n\n')
+                continue
+            for key in keys:
+                counter.add(key, count)
+        args = (count_eojeols, count_exceptions, '%.3f' % (100 * count_exceptions / max(1, count_eojeols)))
+        if verbose:
+            print('Converted {} eojeols with {} ({} %) L-R transformation exception eojeols'.format(*args))
+    return counter
+
+def _pair_to_lr_keys(pair, eojeol_morpheme_pair, noun_xsv_as_verb, xsv_as_root, lr_cache, rules):
+    # counter keys of the converted pair, or None if to_lr fails
+    eojeol, morphtags = pair
+    results = pair_to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, lr_cache=lr_cache, rules=rules)
+    if results is None:
+        return None
+    keys = []
+    for eojeol_, l, r in results:
+        if (not eojeol_) or (l is None):
+            continue
+        morphemes = (l,) if r is None else (l, r)
+        if eojeol_morpheme_pair:
+            keys.append((eojeol_, morphemes))
+        else:
+            keys.extend(morphemes)
+    return keys
+
+def _count_lr_chunk(chunk, eojeol_morpheme_pair, noun_xsv_as_verb, xsv_as_root, lr_cache_size, rules_data=None):
+    # (pair, count, keys) in the order of the first appearance in the chunk.
+    # Only the pairs which fail to convert are sent back
+    lr_cache, rules = _load_lr_cache(lr_cache_size), _load_rules(rules_data)
+    converted = []
+    for pair, count in _count_pairs_chunk(chunk).items():
+        keys = _pair_to_lr_keys(pair, eojeol_morpheme_pair, noun_xsv_as_verb, xsv_as_root, lr_cache, rules)
+        converted.append((pair if keys is None else None, count, keys))
+    return converted
+
+def pair_to_lr(eojeol, morphtags, noun_xsv_as_verb=False, xsv_as_root=False, lr_table=None, lr_cache=None,
+    rules=None):
+    """
+    Arguments
+    ---------
+    eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, lr_table, rules :
+        Same with to_lr
+    lr_cache : LRCache or None
+        Same with the cache of to_lr
+
+    Returns
+    -------
+    list of (eojeol, l, r) or None
+        None if to_lr fails to transform the pair
+    """
+    try:
+        return [(e, l, r) for e, l, r, _, _ in to_lr(eojeol, list(morphtags),
+                noun_xsv_as_verb, xsv_as_root, rules=rules, cache=lr_cache, lr_table=lr_table)]
+    except Exception:
+        return None
+
+def _pairs_chunk_to_lr(chunk, noun_xsv_as_verb, xsv_as_root, lr_table_path, rules_data=None):
+    lr_table = None
+    if lr_table_path is not None:
+        if not (lr_table_path in _worker_lr_tables):
+            _worker_lr_tables[lr_table_path] = LRTable(lr_table_path)
+        lr_table = _worker_lr_tables[lr_table_path]
+    rules = _load_rules(rules_data)
+    return [pair_to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, lr_table, rules=rules)
+            for eojeol, morphtags in chunk]
+
+def parallel_pairs_to_lr(pairs, noun_xsv_as_verb, xsv_as_root, lr_table, n_jobs, chunk_size, rules=None):
+    """
+    Arguments
+    ---------
+    pairs : list of tuple
+        (eojeol, morphtags) pairs
+    noun_xsv_as_verb, xsv_as_root, lr_table, n_jobs, chunk_size, rules :
+        Same with make_lr_corpus
+
+    Returns
+    -------
+    converted : list
+        pair_to_lr result of each pair, in the order of pairs
+    """
+    chunks = [pairs[b: b + chunk_size] for b in range(0, len(pairs), chunk_size)]
+    transform = partial(_pairs_chunk_to_lr, noun_xsv_as_verb=noun_xsv_as_verb, xsv_as_root=xsv_as_root,
+        lr_table_path=None if lr_table is None else lr_table.path, rules_data=_dump_rules(rules))
+    return [result for results in parallel_load_files(chunks, transform, n_jobs) for result in results]
+
+def _count_pairs_chunk(chunk):
+    counter = defaultdict(int)
+    for sent in chunk:
+        for eojeol, morphtags in sent:
+            counter[(eojeol, tuple(morphtags))] += 1
+    return counter
+
+def _count_morphemes_chunk(chunk):
+    counter = defaultdict(int)
+    for sent in chunk:
+        for _, morphtags in sent:
+            for morphtag in morphtags:
+                counter[morphtag] += 1
+    return counter
+
+def parallel_count_pairs(sentences, n_jobs, chunk_size, count_chunk=_count_pairs_chunk):
+    """
+    Arguments
+    ---------
+    sentences : list of Sentence or Sentences
+        Iterable object consists with Sentence instance
+    n_jobs : int
+        Number of worker processes
+    chunk_size : int
+        Number of sentences counted by a worker process at once
+    count_chunk : callable
+        Picklable function counting a list of sentences
+
+    Returns
+    -------
+    counter : defaultdict
+        {(eojeol, tuple of MorphTag): frequency}
+        The partial counters are merged in the order of the chunks, so the keys
+        are ordered by their first appearance as same as counting in one process
+    """
+    counter = defaultdict(int)
+    for partial_counter in parallel_load_files(sentence_chunks(sentences, chunk_size), count_chunk, n_jobs):
+        for key, count in partial_counter.items():
+            counter[key] += count
+    return counter
+
+def sentence_chunks(sentences, chunk_size):
+    """
+    Yields
+    ------
+    chunk : list of list of (eojeol, morphtags)
+        Picklable partition of chunk_size sentences
+    """
+    sents = iter(sentences)
+    while True:
+        chunk = [list(sent) for sent in islice(sents, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+def parallel_count_morphemes(sentences, n_jobs, chunk_size):
+    """
+    Same with parallel_count_pairs, but it returns {MorphTag: frequency}
+    """
+    return parallel_count_pairs(sentences, n_jobs, chunk_size, _count_morphemes_chunk)
+
+def dedup_sentences_to_lr(sentences, noun_xsv_as_verb, xsv_as_root, lr_table, n_jobs, chunk_size, rules=None):
+    """
+    Arguments
+    ---------
+    sentences : list of Sentence or Sentences
+        Iterable object consists with Sentence instance. It is iterated twice
+    noun_xsv_as_verb, xsv_as_root, lr_table, n_jobs, chunk_size, rules :
+        Same with make_lr_corpus
+
+    Yields
+    ------
+    (eojeols_lr, morphtags_lr) or None
+        Same with sentence_to_lr, in the order of sentences
+    """
+    if iter(sentences) is sentences:
+        sentences = list(sentences)
+
+    pairs = collect_eojeol_morphtags(sentences)
+    if n_jobs == 1:
+        converted = [pair_to_lr(eojeol, morphtags, noun_xsv_as_verb, xsv_as_root, lr_table, rules=rules)
+                     for eojeol, morphtags in pairs]
+    else:
+        converted = parallel_pairs_to_lr(pairs, noun_xsv_as_verb, xsv_as_root, lr_table, n_jobs, chunk_size, rules)
+    converted = dict(zip(pairs, converted))
+
+    for sent in sentences:
+        eojeols_lr = []
+        morphtags_lr = []
+        failed = False
+        for eojeol, morphtags in sent:
+            results = converted[(eojeol, tuple(morphtags))]
+            if results is None:
+                failed = True
+                break
+            for e, l, r in results:
+                eojeols_lr.append(e)
+                if r is None:
+                    morphtags_lr.append([l])
+                else:
+                    morphtags_lr.append([l, r])
+        yield None if failed else (eojeols_lr, morphtags_lr)
@@ -0,0 +1,148 @@
+import json
+import os
+
+
+class Manifest:
+    """
+    Per-file sentence and error counts.
+    An entry is invalidated when the size or the modified time of the file changes.
+    An unreadable manifest file is treated as empty.
+
+    Arguments
+    ---------
+    path : str or None
+        Manifest file path. If None, the manifest is kept only in memory
+
+    Usage
+    -----
+        >>> manifest = Manifest('../data/cache/manifest.json')
+        >>> manifest.set('../data/raw/written/BTAA0001.txt', 'raw', 1127, 11)
+        >>> manifest.get('../data/raw/written/BTAA0001.txt', 'raw')
+        $ (1127, 11)
+        >>> manifest.save()
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.modified = False
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                # broken manifest file is overwritten by the next save
+                entries = None
+            if isinstance(entries, dict):
+                self.entries = entries
+
+    def _stat(self, path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, path, option):
+        """
+        Arguments
+        ---------
+        path : str
+            Corpus file path
+        option : str
+            Loading option of the counts
+
+        Returns
+        -------
+        (n_sents, n_errors) or None
+            It returns None if the entry does not exist or the file has been changed
+        """
+        entry = self.entries.get(os.path.abspath(path))
+        if entry is None or (entry['size'], entry['mtime_ns']) != self._stat(path):
+            return None
+        counts = entry['counts'].get(option)
+        return None if counts is None else tuple(counts)
+
+    def set(self, path, option, n_sents, n_errors):
+        """
+        Arguments
+        ---------
+        path : str
+            Corpus file path
+        option : str
+            Loading option of the counts
+        n_sents : int
+            Number of sentences
+        n_errors : int
+            Number of failures for parsing text to Sentence
+        """
+        key = os.path.abspath(path)
+        size, mtime_ns = self._stat(path)
+        entry = self.entries.get(key)
+        if entry is None or (entry['size'], entry['mtime_ns']) != (size, mtime_ns):
+            entry = {'size': size, 'mtime_ns': mtime_ns, 'counts': {}}
+            self.entries[key] = entry
+        if entry['counts'].get(option) != [n_sents, n_errors]:
+            entry['counts'][option] = [n_sents, n_errors]
+            self.modified = True
+
+    def save(self):
+        if self.path is None or not self.modified:
+            return
+        dirname = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(dirname, exist_ok=True)
+        tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.modified = False
+
+    def plan(self, paths, option, num_sents):
+        """
+        Arguments
+        ---------
+        paths : list of str
+            Corpus file paths
+        option : str
+            Loading option of the counts
+        num_sents : int
+            Number of sentences to load
+
+        Returns
+        -------
+        paths : list of str or None
+            The shortest prefix of paths which has at least num_sents sentences
+            It returns None if some file on the way is not counted yet
+        """
+        if num_sents <= 0:
+            return list(paths)
+        n_sents = 0
+        for i, path in enumerate(paths):
+            if n_sents >= num_sents:
+                return list(paths[:i])
+            counts = self.get(path, option)
+            if counts is None:
+                return None
+            n_sents += counts[0]
+        return list(paths)
+
+def count_a_sentences_file(path):
+    """
+    Argument
+    --------
+    path : str
+        Sentences format file path
+
+    Returns
+    -------
+    n_sents : int
+        Number of sentences, the blocks separated by empty lines
+    """
+    n_sents = 0
+    in_sent = False
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                in_sent = True
+            elif in_sent:
+                n_sents += 1
+                in_sent = False
+    if in_sent:
+        n_sents += 1
+    return n_sents
@@ -0,0 +1,185 @@
+from array import array
+import os
+import random
+
+from .loader import parse_a_sentences_block
+
+
+index_version = 1
+
+
+class IndexedSentences:
+    """
+    Random access reader of Sentences format file, such as the output of
+    write_sentences or make_lr_corpus. It uses a side-car byte offset index file,
+    and it builds the index when the index does not exist or the corpus file has been changed.
+
+    Arguments
+    ---------
+    path : str
+        Sentences format file path
+    index_path : str or None
+        Offset index file path. If None, it uses path + '.idx'
+
+    Usage
+    -----
+        >>> sents = IndexedSentences('../data/clean/corpus_type1_all.txt')
+        >>> len(sents)
+        $ 1021527
+
+        >>> sents[1000]    # Sentence
+        >>> sents[10:20]   # list of Sentence
+
+        >>> for sent in sents.iter_permutation(seed=0):
+        >>>     # do something
+    """
+    def __init__(self, path, index_path=None):
+        if index_path is None:
+            index_path = path + '.idx'
+        self.path = path
+        self.index_path = index_path
+        self.offsets = load_offset_index(path, index_path)
+        if self.offsets is None:
+            self.offsets = build_offset_index(path, index_path)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not (0 <= index < len(self)):
+            raise IndexError('IndexedSentences index out of range')
+        return self._get(index)
+
+    def __iter__(self):
+        return self.iter_range(0, len(self))
+
+    def iter_range(self, begin=0, end=None):
+        """
+        Arguments
+        ---------
+        begin : int
+            First sentence index
+        end : int or None
+            Last sentence index + 1. If None, it iterates to the last sentence
+
+        Yields
+        ------
+        sent : Sentence
+            Sentences in [begin, end). It seeks once and reads the file sequentially
+        """
+        if end is None or end > len(self):
+            end = len(self)
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[begin] if begin < end else 0)
+            for i in range(begin, end):
+                text = f.read(self.offsets[i+1] - self.offsets[i]).decode('utf-8')
+                yield parse_a_sentences_block(text)
+
+    def _get(self, i):
+        with open(self.path, 'rb') as f:
+            return self._read(f, i)
+
+    def _read(self, f, i):
+        f.seek(self.offsets[i])
+        text = f.read(self.offsets[i+1] - self.offsets[i]).decode('utf-8')
+        return parse_a_sentences_block(text)
+
+    def iter_permutation(self, seed=None, indices=None):
+        """
+        Arguments
+        ---------
+        seed : int or None
+            Random seed of shuffling
+        indices : list of int or None
+            Sentence indices to iterate. If None, it iterates all sentences
+
+        Yields
+        ------
+        sent : Sentence
+            Sentences in shuffled order. Each sentence costs one seek and one parse
+        """
+        if indices is None:
+            indices = list(range(len(self)))
+        else:
+            indices = list(indices)
+        random.Random(seed).shuffle(indices)
+        with open(self.path, 'rb') as f:
+            for i in indices:
+                yield self._read(f, i)
+
+def build_offset_index(path, index_path=None):
+    """
+    Arguments
+    ---------
+    path : str
+        Sentences format file path
+    index_path : str or None
+        Offset index file path. If None, it uses path + '.idx'
+        If the value is False, it does not write the index
+
+    Returns
+    -------
+    offsets : array of int
+        Byte offset of the first line of each sentence, and the file size at the end.
+        The bytes between two offsets are a sentence and the following empty lines.
+
+    The index file consists with unsigned 64 bit integers
+        [version, file size, modified time (ns), offsets ...]
+    """
+    if index_path is None:
+        index_path = path + '.idx'
+
+    offsets = array('Q')
+    offset = 0
+    in_sent = False
+    with open(path, 'rb') as f:
+        for line in f:
+            # same with the empty line check of iter_a_sentences_file
+            if line.decode('utf-8').strip():
+                if not in_sent:
+                    offsets.append(offset)
+                    in_sent = True
+            else:
+                in_sent = False
+            offset += len(line)
+    offsets.append(offset)
+
+    if index_path:
+        stat = os.stat(path)
+        header = array('Q', [index_version, stat.st_size, stat.st_mtime_ns])
+        tmp_path = '{}.{}.tmp'.format(index_path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            header.tofile(f)
+            offsets.tofile(f)
+        os.replace(tmp_path, index_path)
+    return offsets
+
+def load_offset_index(path, index_path=None):
+    """
+    Arguments
+    ---------
+    path : str
+        Sentences format file path
+    index_path : str or None
+        Offset index file path. If None, it uses path + '.idx'
+
+    Returns
+    -------
+    offsets : array of int or None
+        It returns None if the index does not exist or it is out of date
+    """
+    if index_path is None:
+        index_path = path + '.idx'
+    if not os.path.exists(index_path):
+        return None
+    values = array('Q')
+    with open(index_path, 'rb') as f:
+        values.frombytes(f.read())
+    stat = os.stat(path)
+    if len(values) < 4 or list(values[:3]) != [index_version, stat.st_size, stat.st_mtime_ns]:
+        return None
+    return values[3:]
@@ -0,0 +1,296 @@
+from array import array
+import hashlib
+import heapq
+import math
+
+
+class CountMinSketch:
+    """
+    Count-min sketch. It estimates the frequency of a key with fixed memory.
+    The estimation is never smaller than the true frequency, and it is larger than
+    the true frequency at most epsilon * (total count) with probability 1 - delta.
+
+        width = ceil(e / epsilon)
+        depth = ceil(ln(1 / delta))
+
+    The counts are stored in one unsigned long long array of width * depth,
+    so the memory is 8 * width * depth bytes regardless of the number of keys.
+    Keys are hashed with blake2b of their repr, so the hash is same in every process.
+
+    Arguments
+    ---------
+    epsilon : float
+        Relative error bound. Default is 0.00001
+    delta : float
+        Probability that the error exceeds the bound. Default is 0.01
+
+    Usage
+    -----
+        >>> sketch = CountMinSketch(epsilon=0.00001, delta=0.01)
+        >>> sketch.add(('있다', (있/VA, 다/EF)))
+        >>> sketch[('있다', (있/VA, 다/EF))]
+        $ 1
+    """
+    def __init__(self, epsilon=0.00001, delta=0.01):
+        if not (0 < epsilon < 1):
+            raise ValueError('epsilon must be in (0, 1) but {}'.format(epsilon))
+        if not (0 < delta < 1):
+            raise ValueError('delta must be in (0, 1) but {}'.format(delta))
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = int(math.ceil(math.e / epsilon))
+        self.depth = int(math.ceil(math.log(1 / delta)))
+        self.table = array('Q', [0]) * (self.width * self.depth)
+        self.n_total = 0
+
+    def _indices(self, key):
+        # double hashing : h1 + i * h2 (Kirsch & Mitzenmacher, 2006)
+        digest = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        width = self.width
+        return [i * width + (h1 + i * h2) % width for i in range(self.depth)]
+
+    def add(self, key, count=1):
+        """
+        Arguments
+        ---------
+        key : hashable
+            Key whose repr is same for the same key
+        count : int
+            Frequency added to the key
+
+        Returns
+        -------
+        estimation : int
+            Estimated frequency of the key after adding
+        """
+        table = self.table
+        estimation = None
+        for i in self._indices(key):
+            table[i] += count
+            if estimation is None or table[i] < estimation:
+                estimation = table[i]
+        self.n_total += count
+        return estimation
+
+    def __getitem__(self, key):
+        table = self.table
+        return min(table[i] for i in self._indices(key))
+
+    @property
+    def error_bound(self):
+        """
+        Returns
+        -------
+        error : float
+            Estimation exceeds the true frequency at most this value with probability 1 - delta
+        """
+        return self.epsilon * self.n_total
+
+
+class SpaceSaving:
+    """
+    Space-saving heavy hitter list (Metwally et al., 2005).
+    It monitors at most k keys. A new key replaces the least frequent monitored key
+    and inherits its frequency as the error. Every key whose frequency is larger than
+    (total count) / k is monitored, and the count of a monitored key is larger than
+    its true frequency at most its error.
+    If the number of distinct keys is not larger than k, the counts are exact.
+
+    Arguments
+    ---------
+    k : int
+        Maximum number of monitored keys
+
+    Usage
+    -----
+        >>> heavy_hitters = SpaceSaving(k=1000)
+        >>> heavy_hitters.add('있/VA')
+        >>> heavy_hitters.most_common(10)
+    """
+    def __init__(self, k):
+        if k <= 0:
+            raise ValueError('k must be positive but {}'.format(k))
+        self.k = k
+        self.counts = {}
+        self.errors = {}
+        # {key: order of monitoring}. Ties of frequency keep this order
+        self._order = {}
+        self._n_monitored = 0
+        # (count, order, key) with stale entries. It is rebuilt when it grows
+        self._heap = []
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, key):
+        return key in self.counts
+
+    def __getitem__(self, key):
+        return self.counts.get(key, 0)
+
+    def _push(self, key):
+        heapq.heappush(self._heap, (self.counts[key], self._order[key], key))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(count, self._order[key_], key_) for key_, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        heap, counts, order = self._heap, self.counts, self._order
+        while True:
+            count, i, key = heapq.heappop(heap)
+            if key in counts and counts[key] == count and order[key] == i:
+                return key
+
+    def add(self, key, count=1):
+        """
+        Arguments
+        ---------
+        key : hashable
+            Key
+        count : int
+            Frequency added to the key
+
+        Returns
+        -------
+        evicted : key or None
+            The key which is not monitored anymore
+        """
+        counts = self.counts
+        evicted = None
+        if key in counts:
+            counts[key] += count
+        else:
+            error = 0
+            if len(counts) >= self.k:
+                evicted = self._pop_min()
+                error = counts.pop(evicted)
+                del self.errors[evicted]
+                del self._order[evicted]
+            counts[key] = error + count
+            self.errors[key] = error
+            self._order[key] = self._n_monitored
+            self._n_monitored += 1
+        self._push(key)
+        return evicted
+
+    def most_common(self, n=None):
+        """
+        Argument
+        --------
+        n : int or None
+            Number of returned items. If None, it returns all monitored keys
+
+        Returns
+        -------
+        list of (key, count)
+            Sorted by count in decreasing order. Ties keep the order of monitoring
+        """
+        order = self._order
+        items = sorted(self.counts.items(), key=lambda x: (-x[1], order[x[0]]))
+        return items if n is None else items[:n]
+
+
+class ApproximateCounter:
+    """
+    Fixed memory counter of the most frequent keys.
+    It combines CountMinSketch, which estimates the frequency of any key,
+    with SpaceSaving, which keeps the top-k candidate keys.
+    Both give upper bounds of the true frequency, so the smaller one is reported.
+
+    Memory is 8 * width * depth bytes of the sketch and k monitored keys.
+    If the number of distinct keys is not larger than top_k, the counts and the order
+    of most_common are same with exact counting.
+
+    Arguments
+    ---------
+    top_k : int
+        Number of monitored keys. Default is 100000
+    epsilon : float
+        Relative error bound of the sketch. Default is 0.00001
+    delta : float
+        Probability that the error of the sketch exceeds the bound. Default is 0.01
+
+    Attributes
+    ----------
+    n_total : int
+        Sum of all added counts
+
+    Usage
+    -----
+        >>> counter = ApproximateCounter(top_k=10000, epsilon=0.00001, delta=0.01)
+        >>> for sent in sents:
+        >>>     for eojeol, morphtags in sent:
+        >>>         counter.add((eojeol, tuple(morphtags)))
+        >>> counter.most_common(2)
+        $ [(('등', (등/NNB,)), 20), (('있다', (있/VA, 다/EF)), 19)]
+        >>> counter.error_bound
+    """
+    def __init__(self, top_k=100000, epsilon=0.00001, delta=0.01):
+        self.sketch = CountMinSketch(epsilon, delta)
+        self.heavy_hitters = SpaceSaving(top_k)
+
+    @property
+    def top_k(self):
+        return self.heavy_hitters.k
+
+    @property
+    def n_total(self):
+        return self.sketch.n_total
+
+    @property
+    def error_bound(self):
+        """
+        Returns
+        -------
+        error : float
+            Reported frequency exceeds the true frequency at most this value with probability 1 - delta
+        """
+        return self.sketch.error_bound
+
+    def __len__(self):
+        return len(self.heavy_hitters)
+
+    def add(self, key, count=1):
+        self.sketch.add(key, count)
+        self.heavy_hitters.add(key, count)
+
+    def __getitem__(self, key):
+        estimation = self.sketch[key]
+        if key in self.heavy_hitters:
+            estimation = min(estimation, self.heavy_hitters[key])
+        return estimation
+
+    def most_common(self, n=None):
+        """
+        Argument
+        --------
+        n : int or None
+            Number of returned items. If None, it returns all top_k items
+
+        Returns
+        -------
+        list of (key, frequency)
+            Sorted by estimated frequency in decreasing order
+        """
+        sketch = self.sketch
+        items = [(key, min(count, sketch[key])) for key, count in self.heavy_hitters.most_common()]
+        # stable sort keeps the order of space-saving for ties
+        items = sorted(items, key=lambda x: -x[1])
+        return items if n is None else items[:n]
+
+    def items(self):
+        return self.most_common()
+
+    def keys(self):
+        return [key for key, _ in self.most_common()]
+
+    def values(self):
+        return [count for _, count in self.most_common()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def to_dict(self):
+        return dict(self.most_common())
@@ -1,10 +1,10 @@
 import os
-import sys
 import subprocess
 
 sep = os.path.sep
 install_path = sep.join(os.path.abspath(__file__).split(sep)[:-1])
 data_dir = sep.join(os.path.abspath(__file__).split(sep)[:-2] + ['data', 'raw', ''])
+cache_dir = sep.join(os.path.abspath(__file__).split(sep)[:-2] + ['data', 'cache', ''])
 
 def check_encoding(paths):
     """
@@ -89,6 +89,8 @@ unicode_mapper = {
   'ᄒ': 'ㅎ', # 4370
 }
 
+unicode_table = str.maketrans(unicode_mapper)
+
 def unicode_character(c):
     return unicode_mapper.get(c, c)
 
@@ -104,7 +106,7 @@ def unicode_sentence(sent):
     sent : str
         Fix non-unicode character
     """
-    return ''.join(unicode_character(c) for c in sent)
+    return sent.translate(unicode_table)
 
 hangle_begin = 44032
 hangle_end = 55203
@@ -138,6 +140,22 @@ jongsung_list = [
     'ㅌ', 'ㅍ', 'ㅎ'
 ]
 
+# {syllable or jamo: (chosung, jungsung, jongsung)}
+decompose_table = {}
+for i, cho in enumerate(chosung_list):
+    for j, jung in enumerate(jungsung_list):
+        for k, jong in enumerate(jongsung_list):
+            decompose_table[chr(hangle_begin + chosung_base * i + jungsung_base * j + k)] = (cho, jung, jong)
+for i in range(jaum_begin, jaum_end + 1):
+    decompose_table[chr(i)] = (chr(i), ' ', ' ')
+for i in range(moum_begin, moum_end + 1):
+    decompose_table[chr(i)] = (' ', chr(i), ' ')
+# {(chosung, jungsung, jongsung): syllable}
+compose_table = {cjj: c for c, cjj in decompose_table.items() if hangle_begin <= ord(c) <= hangle_end}
+# str.translate table removing jaum and moum. jaum and moum ranges are contiguous
+jamo_remover = {i: None for i in range(jaum_begin, moum_end + 1)}
+del i, j, k, cho, jung, jong
+
 def is_hangle(c):
     return hangle_begin <= ord(c) <= hangle_end
 
@@ -148,6 +166,10 @@ def is_moum(c):
     return moum_begin <= ord(c) <= moum_end
 
 def compose(chosung, jungsung, jongsung):
+    hangle = compose_table.get((chosung, jungsung, jongsung))
+    if hangle is not None:
+        return hangle
+    # raises ValueError of list.index
     hangle = chr(
         hangle_begin +
         chosung_base * chosung_list.index(chosung) +
@@ -157,18 +179,49 @@ def compose(chosung, jungsung, jongsung):
     return hangle
 
 def decompose(c):
-    i = ord(c)
-    if (jaum_begin <= i <= jaum_end):
-        return (c, ' ', ' ')
-    if (moum_begin <= i <= moum_end):
-        return (' ', c, ' ')
-    if not (hangle_begin <= i <= hangle_end):
+    cjj = decompose_table.get(c)
+    if cjj is None:
         return (c, '', '')
-    i -= hangle_begin
-    cho  = i // chosung_base
-    jung = ( i - cho * chosung_base ) // jungsung_base
-    jong = ( i - cho * chosung_base - jung * jungsung_base )
-    return (chosung_list[cho], jungsung_list[jung], jongsung_list[jong])
+    return cjj
+
+def decompose_string(s):
+    """
+    Argument
+    --------
+    s : str
+        Input string
+
+    Returns
+    -------
+    list of tuple
+        (chosung, jungsung, jongsung) of each character. Same with [decompose(c) for c in s]
+
+    Usage
+    -----
+        >>> decompose_string('이뤄')
+        $ [('ㅇ', 'ㅣ', ' '), ('ㄹ', 'ㅝ', ' ')]
+    """
+    get = decompose_table.get
+    return [get(c) or (c, '', '') for c in s]
+
+def remove_jamo(s):
+    """
+    Argument
+    --------
+    s : str
+        Input string
+
+    Returns
+    -------
+    str
+        String without jaum and moum characters
+
+    Usage
+    -----
+        >>> remove_jamo('하ㄴ다')
+        $ '하다'
+    """
+    return s.translate(jamo_remover)
 
 def check_lr_transformation(eojeol, l, r, debug=False):
     """
@@ -262,8 +315,11 @@ def check_lr_transformation(eojeol, l, r, debug=False):
 
     # ('퍼질고', [('퍼지르', 'VV'), ('고', 'EC')], False, False),
     #   -> ('퍼질고', ('퍼지르', 'Verb'), ('고', 'Eomi'))
-    if (b >= 3) and (l_surf[:-2] == l[0][:-2]) and (decompose(l_surf[-2])[:1] == decompose(l[0][-2])[:1]) and (decompose(l_surf[-2])[2] == decompose(l[0][-1])[0]):
-        return True
+    if (b >= 3) and (l_surf[:-2] == l[0][:-2]):
+        cho2_surf, _, jong2_surf = decompose(l_surf[-2])
+        (cho2_canon, _, _), (cho1_canon, _, _) = decompose_string(l[0][-2:])
+        if (cho2_surf == cho2_canon) and (jong2_surf == cho1_canon):
+            return True
 
     # ('스쳐갔다', ('스쳐가', 'Verb'), ('았다', 'Eomi'))
     # ('사는', ('살', 'Verb'), ('는', 'Eomi'))
@@ -281,9 +337,7 @@ def check_lr_transformation(eojeol, l, r, debug=False):
     # ('이뤄진', [('이루어지', 'VV'), ('ㄴ', 'ETM')], False, False)
     # ('이뤄진다고', [('이루어지', 'VV'), ('ㄴ다고', 'EC')], False, False)
     if len(l[0]) >= 3 and r[0] and is_jaum(r[0][0]):
-        cho3, jung3, jong3 = decompose(l[0][-3])
-        cho2, jung2, jong2 = decompose(l[0][-2])
-        cho1, jung1, jong1 = decompose(l[0][-1])
+        (cho3, jung3, jong3), (cho2, jung2, jong2), (cho1, jung1, jong1) = decompose_string(l[0][-3:])
         comb_boundary = compose(cho1, jung1, r[0][0])
         comb_l = compose(cho3, 'ㅝ', ' ')
         if jung3 == 'ㅜ' and jong3 == ' ' and l[0][-2] == '어' and comb_l == l_surf[-2] or comb_l == l_surf[-3]:
@@ -0,0 +1,261 @@
+import json
+import os
+
+from .loader import MorphTag
+from .simple_tag import to_simple_tag
+
+
+vocabulary_version = 1
+
+
+class Vocabulary:
+    """
+    Corpus-wide interning table. It maps eojeols, morphemes, tags, simple tags
+    and (morph, tag) pairs to dense integer ids. Ids are never reassigned,
+    so a vocabulary saved to file keeps the ids stable across runs.
+    Each (morph, tag) pair has only one MorphTag instance.
+
+    Arguments
+    ---------
+    path : str or None
+        Vocabulary file path. If the file exists, it is loaded.
+        If None, the vocabulary is kept only in memory
+    tagmap : dict of (str, str) or None
+        Tag mapper used by simple_tag_id. If None, use default tagmap
+
+    Usage
+    -----
+        >>> vocabulary = Vocabulary('../data/clean/vocabulary.json')
+        >>> vocabulary.encode_morphtag('프랑스', 'NNP')
+        $ 0
+        >>> vocabulary.morphtag(0)
+        $ 프랑스/NNP
+        >>> vocabulary.simple_tag(vocabulary.simple_tag_id(vocabulary.morphtag_tag_id(0)))
+        $ 'Noun'
+
+        >>> sents = Sentences(paths, vocabulary=vocabulary)
+        >>> counter = make_counter(sents, vocabulary=vocabulary)
+        >>> vocabulary.save()
+    """
+    def __init__(self, path=None, tagmap=None):
+        self.path = path
+        self.tagmap = tagmap
+        self.eojeols = []
+        self.morphs = []
+        self.tags = []
+        self.simple_tags = []
+        self.morphtag_ids = []  # list of (morph id, tag id)
+        self._indices = {name: {} for name in ['eojeols', 'morphs', 'tags', 'simple_tags', 'morphtag_ids']}
+        self._morphtags = []
+        self._tag_to_simple = []
+        self.modified = False
+        if path is not None and os.path.exists(path):
+            self._load(path)
+
+    def _load(self, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data['version'] != vocabulary_version:
+            raise ValueError('Not supported vocabulary version {}'.format(data['version']))
+        for name in ['eojeols', 'morphs', 'tags', 'simple_tags']:
+            for s in data[name]:
+                self._encode(name, s)
+        for morph_id, tag_id in data['morphtag_ids']:
+            self._encode_pair(morph_id, tag_id)
+        self.modified = False
+
+    def save(self, path=None):
+        """
+        Argument
+        --------
+        path : str or None
+            Vocabulary file path. If None, it uses the path of constructor
+        """
+        if path is None:
+            path = self.path
+        if path is None:
+            raise ValueError('Vocabulary file path is not specified')
+        dirname = os.path.dirname(os.path.abspath(path))
+        os.makedirs(dirname, exist_ok=True)
+        data = {
+            'version': vocabulary_version,
+            'eojeols': self.eojeols,
+            'morphs': self.morphs,
+            'tags': self.tags,
+            'simple_tags': self.simple_tags,
+            'morphtag_ids': self.morphtag_ids
+        }
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        if path == self.path:
+            self.modified = False
+
+    def _encode(self, name, s):
+        index = self._indices[name]
+        i = index.get(s)
+        if i is None:
+            values = getattr(self, name)
+            i = len(values)
+            index[s] = i
+            values.append(s)
+            self.modified = True
+        return i
+
+    def _encode_pair(self, morph_id, tag_id):
+        key = (morph_id, tag_id)
+        index = self._indices['morphtag_ids']
+        i = index.get(key)
+        if i is None:
+            i = len(self.morphtag_ids)
+            index[key] = i
+            self.morphtag_ids.append(key)
+            self._morphtags.append(None)
+            self.modified = True
+        return i
+
+    def encode_eojeol(self, eojeol):
+        return self._encode('eojeols', eojeol)
+
+    def encode_morph(self, morph):
+        return self._encode('morphs', morph)
+
+    def encode_tag(self, tag):
+        return self._encode('tags', tag)
+
+    def encode_morphtag(self, morph, tag):
+        return self._encode_pair(self.encode_morph(morph), self.encode_tag(tag))
+
+    def encode_eojeol_morphtags(self, eojeol, morphtags):
+        """
+        Arguments
+        ---------
+        eojeol : str
+            Eojeol
+        morphtags : list of MorphTag
+            Or list of (morph, tag)
+
+        Returns
+        -------
+        key : tuple
+            (eojeol id, tuple of morphtag ids)
+        """
+        encode = self.encode_morphtag
+        return self.encode_eojeol(eojeol), tuple(encode(morph, tag) for morph, tag in morphtags)
+
+    def find_morphtag(self, morph, tag):
+        """
+        Arguments
+        ---------
+        morph : str
+            Morpheme
+        tag : str
+            Tag
+
+        Returns
+        -------
+        morphtag_id : int or None
+            It returns None if the pair is not in the vocabulary. It does not add the pair
+        """
+        morph_id = self._indices['morphs'].get(morph)
+        tag_id = self._indices['tags'].get(tag)
+        if morph_id is None or tag_id is None:
+            return None
+        return self._indices['morphtag_ids'].get((morph_id, tag_id))
+
+    def find_eojeol_morphtags(self, eojeol, morphtags):
+        """
+        Arguments
+        ---------
+        eojeol : str
+            Eojeol
+        morphtags : list of MorphTag
+            Or list of (morph, tag)
+
+        Returns
+        -------
+        key : tuple or None
+            (eojeol id, tuple of morphtag ids)
+            It returns None if any of them is not in the vocabulary. It does not add them
+        """
+        eojeol_id = self._indices['eojeols'].get(eojeol)
+        if eojeol_id is None:
+            return None
+        morphtag_ids = tuple(self.find_morphtag(morph, tag) for morph, tag in morphtags)
+        if None in morphtag_ids:
+            return None
+        return eojeol_id, morphtag_ids
+
+    def encode_sentence(self, sentence):
+        """
+        Argument
+        --------
+        sentence : Sentence or CompactSentence
+            Or iterable of (eojeol, list of (morph, tag))
+
+        Returns
+        -------
+        keys : list of tuple
+            List of (eojeol id, tuple of morphtag ids)
+            The ids of CompactSentence sharing this vocabulary are used without decoding
+        """
+        if getattr(sentence, 'table', None) is self:
+            return list(sentence.iter_ids())
+        return [self.encode_eojeol_morphtags(eojeol, morphtags) for eojeol, morphtags in sentence]
+
+    def eojeol(self, i):
+        return self.eojeols[i]
+
+    def morph(self, i):
+        return self.morphs[i]
+
+    def tag(self, i):
+        return self.tags[i]
+
+    def simple_tag(self, i):
+        return self.simple_tags[i]
+
+    def morphtag(self, i):
+        morphtag = self._morphtags[i]
+        if morphtag is None:
+            morph_id, tag_id = self.morphtag_ids[i]
+            morphtag = MorphTag(self.morphs[morph_id], self.tags[tag_id])
+            self._morphtags[i] = morphtag
+        return morphtag
+
+    def morphtag_tag_id(self, i):
+        return self.morphtag_ids[i][1]
+
+    def simple_tag_id(self, tag_id):
+        """
+        Argument
+        --------
+        tag_id : int
+            Tag id
+
+        Returns
+        -------
+        simple_tag_id : int
+            Id of the simplified tag
+        """
+        table = self._tag_to_simple
+        while len(table) <= tag_id:
+            simple_tag = to_simple_tag(self.tags[len(table)], self.tagmap)
+            table.append(self._encode('simple_tags', simple_tag))
+        return table[tag_id]
+
+    def decode_eojeol_morphtags(self, key):
+        """
+        Argument
+        --------
+        key : tuple
+            (eojeol id, tuple of morphtag ids)
+
+        Returns
+        -------
+        (eojeol, tuple of MorphTag)
+        """
+        eojeol_id, morphtag_ids = key
+        morphtag = self.morphtag
+        return self.eojeols[eojeol_id], tuple(morphtag(i) for i in morphtag_ids)